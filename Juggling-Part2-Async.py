@@ -0,0 +1,48 @@
+""" lesson 2 (async): cooperative parallelism, done by python
+
+This is the threads lesson again, without threads. Like in lesson 1, each ship's function has to give the others a
+turn. But here python's asyncio does the juggling: an "async def" function can "await" a sleep, and while it waits
+everything else (the other ship, the drawing) keeps running.
+
+Students should compare the "ship1" and "ship2" functions here with lesson 2. They are the same, except for "async" and
+"await asyncio.sleep" in place of "time.sleep".
+
+CHALLENGE: can you slow ship1 without slowing ship2? Can you add a hundred ships?
+"""
+import asyncio
+
+import juggling.pygame
+from juggling.data import Ship
+from juggling.pygame import run_async
+
+
+# Create two ships as global variables. Why use evil globals? It's EASY!
+SHIP_1 = Ship(100)
+SHIP_2 = Ship(300)
+
+
+async def ship1(ship):
+    """
+    Control function for ship1. This function is passed the ship as input and is free to update it. While it awaits
+    its sleep, python runs the other ship and the drawing.
+    """
+    while juggling.pygame.RUN:
+        x, y = ship.position
+        ship.position = x + 1, y
+        await asyncio.sleep(0.010)  # Give the others a turn, while slowing this ship down
+
+
+async def ship2(ship):
+    """
+    Control function for ship2. This function is passed the ship as input and is free to update it. While it awaits
+    its sleep, python runs the other ship and the drawing.
+    """
+    while juggling.pygame.RUN:
+        x, y = ship.position
+        ship.position = x + 1, y
+        await asyncio.sleep(0.010)  # Give the others a turn, while slowing this ship down
+
+
+if __name__ == "__main__":
+    # Do nothing move function, just run the drawing loop with our ships as controllers!
+    run_async(lambda: None, SHIP_1, SHIP_2, controllers=[ship1(SHIP_1), ship2(SHIP_2)])
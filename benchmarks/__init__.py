@@ -0,0 +1,7 @@
+""" benchmarks:
+
+Timing scripts for the maze game. Run them from the top of the repository (the images live in Related/) as modules,
+e.g. `python -m benchmarks.floodfill`. `python -m benchmarks.run` runs the whole suite, writing JSON results that can be
+compared between two runs to catch regressions, and `python -m benchmarks.walls` checks maze generation against a
+flood fill.
+"""
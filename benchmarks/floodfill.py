@@ -0,0 +1,36 @@
+""" benchmarks.floodfill:
+
+Shows how the breadth-first flood fill behind FloodFill.cache scales with the size of the maze. Generating the maze is
+timed separately, such that only the flood fill is counted against it.
+
+    python -m benchmarks.floodfill [size ...]
+"""
+import sys
+import time
+
+from juggling.maze import Maze
+from juggling.utilities import FloodFill
+
+SIZES = [100, 250, 500, 1000, 2000]
+
+
+def run(size):
+    """ Time the generation and the flood fill of one size x size maze """
+    start = time.perf_counter()
+    maze = Maze(size, size)
+    generated = time.perf_counter()
+    FloodFill.cache(maze, False)
+    flooded = time.perf_counter()
+    return generated - start, flooded - generated, len(maze)
+
+
+def main(sizes):
+    """ Run each size and print a table """
+    print(f"{'size':>11} {'cells':>10} {'generate (s)':>13} {'flood (s)':>10} {'cells/s':>12}")
+    for size in sizes:
+        generate, flood, cells = run(size)
+        print(f"{size:>5}x{size:<5} {cells:>10} {generate:>13.3f} {flood:>10.3f} {cells / flood:>12.0f}")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,168 @@
+""" benchmarks.run:
+
+The benchmark suite: times maze generation (Maze.randomize), solving (FloodFill.cache, FloodFill.solve and the next
+step of every Difficulty), drawing (Game.draw_maze into an offscreen surface) and tictactoe.is_winner, each across a
+range of maze sizes, and writes the results out as JSON. Two result files can then be compared to flag regressions.
+
+    python -m benchmarks.run [--sizes 12 25 50] [--output results.json]
+    python -m benchmarks.run --compare before.json after.json [--threshold 0.2]
+
+Comparing exits with 1 when any benchmark got slower by more than the threshold (a fraction, 0.2 being 20%). Drawing
+uses SDL's dummy video driver unless SDL_VIDEODRIVER is already set, so no window is needed.
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import random
+import sys
+import time
+from array import array
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from juggling.maze import Maze, Game, Difficulty, ExternalControlPlayer
+from juggling.utilities import CellType, FloodFill
+
+SIZES = [12, 25, 50, 100]
+# Minimum seconds spent timing each benchmark, repeating the call as often as fits
+MINIMUM_TIME = 0.2
+PAIRS = 64
+BOARDS = 1000
+
+
+def measure(function):
+    """ Seconds per call of function, the best of three rounds each at least a third of MINIMUM_TIME long """
+    best = None
+    for _ in range(0, 3):
+        calls, start = 0, time.perf_counter()
+        while calls == 0 or time.perf_counter() - start < MINIMUM_TIME / 3:
+            function()
+            calls += 1
+        per_call = (time.perf_counter() - start) / calls
+        best = per_call if best is None else min(best, per_call)
+    return best
+
+
+def load_is_winner(path="tictactoe.py"):
+    """ Load is_winner out of tictactoe.py without running the game the rest of the file starts on import """
+    with open(path) as file_handle:
+        tree = ast.parse(file_handle.read(), path)
+    functions = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == "is_winner"]
+    namespace = {}
+    exec(compile(ast.Module(body=functions, type_ignores=[]), path, "exec"), namespace)
+    return namespace["is_winner"]
+
+
+def random_pairs(maze):
+    """ PAIRS random (position, goal) pairs of path cells in the maze """
+    cells = [cell for cell in maze if cell.type == CellType.PATH]
+    return [tuple(random.sample(cells, 2)) for _ in range(0, PAIRS)]
+
+
+def cycle(function, pairs):
+    """ Function calling function with the next of pairs each call """
+    state = {"index": 0}
+
+    def call():
+        position, goal = pairs[state["index"] % len(pairs)]
+        state["index"] += 1
+        function(position, goal)
+    return call
+
+
+def flood(maze):
+    """ Function flooding maze from scratch each call, clearing the scores the last call left behind first """
+    blank = array("i", [-1]) * len(maze)
+
+    def call():
+        maze.set_scores(blank)
+        FloodFill.cache(maze, False)
+    return call
+
+
+def maze_benchmarks(size):
+    """ Benchmarks of one size of maze, as a dictionary of name to seconds per call """
+    results = {"Maze.randomize": measure(Maze(size, size).randomize)}
+    maze = FloodFill.cache(Maze(size, size), False)
+    pairs = random_pairs(maze)
+    results["FloodFill.cache"] = measure(flood(maze))
+    results["FloodFill.solve"] = measure(cycle(lambda position, goal: FloodFill.solve(maze, position, goal), pairs))
+    for difficulty in Difficulty:
+        solver = difficulty.value
+        results[f"Difficulty.{difficulty.name}.next"] = measure(
+            cycle(lambda position, goal: solver.next(position, maze, goal), pairs))
+
+    game = Game(Difficulty.HARD, ExternalControlPlayer(), width=size, height=size, maze=maze)
+    # Place the players without starting their threads, only their drawing is timed
+    for player, cell in zip(game.players(), pairs[0]):
+        player.x, player.y = cell.x, cell.y
+    surface = pygame.Surface((1400, 900))
+    results["Game.draw_maze"] = measure(lambda: game.draw_maze(surface))
+    return results
+
+
+def run(sizes, seed=0):
+    """ Run every benchmark, returning the results ready to be written as JSON """
+    random.seed(seed)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    is_winner = load_is_winner()
+    boards = [[[random.choice([0, 1, 10]) for _ in range(0, 3)] for _ in range(0, 3)] for _ in range(0, BOARDS)]
+    results = {f"tictactoe.is_winner[{BOARDS} boards]": measure(lambda: [is_winner(board) for board in boards])}
+    for size in sizes:
+        print(f"Running {size}x{size}...", file=sys.stderr)
+        results.update({f"{name}[{size}]": seconds for name, seconds in maze_benchmarks(size).items()})
+    pygame.quit()
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(before, after, threshold):
+    """ Print each benchmark's change from before to after, returning the names that got slower than threshold """
+    regressions = []
+    print(f"{'benchmark':<45} {'before (ms)':>12} {'after (ms)':>12} {'change':>8}")
+    for name, seconds in after["results"].items():
+        if name not in before["results"]:
+            print(f"{name:<45} {'-':>12} {seconds * 1000:>12.4f} {'new':>8}")
+            continue
+        change = seconds / before["results"][name] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        regressions += [name] if flag else []
+        print(f"{name:<45} {before['results'][name] * 1000:>12.4f} {seconds * 1000:>12.4f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    """ Run the suite or compare two runs, per the command line """
+    parser = argparse.ArgumentParser(description="Benchmark maze generation, solving and drawing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="maze sizes to run")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the mazes and positions")
+    parser.add_argument("--output", help="JSON file to write the results to, printed if not given")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two JSON result files")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown counted as a regression (0.2 = 20%%)")
+    arguments = parser.parse_args()
+
+    if arguments.compare:
+        with open(arguments.compare[0]) as before, open(arguments.compare[1]) as after:
+            regressions = compare(json.load(before), json.load(after), arguments.threshold)
+        print(f"{len(regressions)} regression(s)")
+        sys.exit(1 if regressions else 0)
+
+    results = run(arguments.sizes, arguments.seed)
+    if arguments.output is None:
+        print(json.dumps(results, indent=2))
+        return
+    with open(arguments.output, "w") as file_handle:
+        json.dump(results, file_handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+""" benchmarks.ships:
+
+Stress scene for the ship lessons: a fleet of ships (10,000 by default) moved and drawn every frame through
+juggling.pygame.main, reporting the frames per second actually reached (the target is juggling.pygame.FPS). Set
+SDL_VIDEODRIVER=dummy to run it without a window.
+
+    python -m benchmarks.ships [ships] [seconds]
+"""
+import random
+import sys
+import time
+
+import juggling.pygame
+from juggling.data import ShipFleet
+from juggling.pygame import main
+
+
+def stress(count, seconds):
+    """ Fly count ships for the given number of seconds, returning frames drawn per second """
+    width, height = 1400, 900
+    fleet = ShipFleet([random.uniform(0, height - 10) for _ in range(count)],
+                      [random.uniform(0.5, 4.0) for _ in range(count)], size=(10, 10))
+    frames = [0]
+    start = time.perf_counter()
+
+    def move():
+        """ Move the fleet and stop after the given time """
+        fleet.move(wrap=width)
+        frames[0] += 1
+        juggling.pygame.RUN = (time.perf_counter() - start) < seconds
+
+    main(move, fleet)
+    return frames[0] / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    ships = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    print(f"{ships} ships: {stress(ships, duration):.1f} frames/s (target {juggling.pygame.FPS})")
@@ -0,0 +1,70 @@
+""" benchmarks.solve:
+
+Per-call latency of the AI's thinking for Difficulty.HARD and Difficulty.VERY_HARD, before and after taking
+copy.deepcopy off the solve path. "before" is how FloodFill.next used to think: deep-copy the maze, score the copy
+depth-first with the recursive scorer and walk the path back. "solve" is FloodFill.solve scoring into its scratch
+buffer, and "next" is the AI's step as it is now (see FloodFill.distance_map).
+
+    python -m benchmarks.solve [size ...]
+"""
+import copy
+import random
+import sys
+import time
+
+from juggling.maze import Maze, Difficulty
+from juggling.utilities import CellType, Direction, FloodFill
+
+SIZES = [12, 25, 50]
+CALLS = 200
+
+
+def first_step(path, position):
+    """ Direction of the first step of a path """
+    return Direction(path[1] - position) if path and len(path) > 1 else Direction.STAY
+
+
+def before(position, maze, goal):
+    """ Think the way FloodFill.next used to: score a deep copy of the maze with the recursive scorer """
+    maze_copy = copy.deepcopy(maze)
+    for cell in maze_copy:
+        cell.score = len(maze_copy) + 1
+    FloodFill.recursive_scorer(maze_copy, maze_copy[goal], 0, maze_copy[position])
+    return first_step(FloodFill.recursive_walker(maze_copy, maze_copy[position]), position)
+
+
+def after(position, maze, goal):
+    """ Think using FloodFill.solve as it is now """
+    return first_step(FloodFill.solve(maze, position, goal), position)
+
+
+def chase(maze, thinking, solver):
+    """ Chase a randomly walking goal for CALLS turns, thinking every thinking turns. Returns seconds per call. """
+    cells = [cell for cell in maze if cell.type == CellType.PATH]
+    position, goal = random.sample(cells, 2)
+    start = time.perf_counter()
+    for turn in range(0, CALLS):
+        move = solver(position, maze, goal) if turn % thinking == 0 else Direction.STAY
+        position = maze[position + move]
+        step = maze[goal + random.choice(list(Direction))]
+        goal = step if step.type != CellType.WALL else goal
+    return (time.perf_counter() - start) / CALLS
+
+
+def main(sizes):
+    """ Time each difficulty on each size and print a table """
+    print(f"{'difficulty':>10} {'size':>7} {'before (us)':>12} {'solve (us)':>11} {'next (us)':>10}")
+    for size in sizes:
+        maze = FloodFill.cache(Maze(size, size), False)
+        for difficulty in [Difficulty.HARD, Difficulty.VERY_HARD]:
+            thinking = difficulty.value.thinking
+            timings = [
+                chase(maze, thinking, before),
+                chase(maze, thinking, after),
+                chase(maze, 1, difficulty.value.next),
+            ]
+            print(f"{difficulty.name:>10} {size:>7}", *[f"{timing * 1e6:>11.1f}" for timing in timings])
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,63 @@
+""" benchmarks.walls:
+
+Checks every decision Maze._walls makes against a brute-force flood fill, then times maze generation. A wall may go on
+a cell touching at most 3 walls when every walkable cell is still reachable from the exit after it is placed.
+
+    python -m benchmarks.walls [mazes] [size]
+"""
+import collections
+import sys
+import time
+
+from juggling.maze import Maze
+from juggling.utilities import cardinal_steps
+
+SIZES = [100, 250, 500]
+
+
+class CheckedMaze(Maze):
+    """ A maze checking each wall it places or rejects with a flood fill from the exit """
+    decisions = 0
+    wrong = 0
+
+    def _wall_fits(self, wall, walls, index, ring_steps):
+        """ Decide as Maze does, counting the decisions a flood fill disagrees with """
+        fits = super()._wall_fits(wall, walls, index, ring_steps)
+        CheckedMaze.decisions += 1
+        CheckedMaze.wrong += fits != self.flood_fits(wall, index, ring_steps)
+        return fits
+
+    def flood_fits(self, wall, index, ring_steps):
+        """ Whether a wall fits at index, flooding the whole maze with the wall in place """
+        if sum(wall[index + step] for step in ring_steps) > 3:
+            return False
+        trial = bytearray(wall)
+        trial[index] = 1
+        start = self.exit.y * self.full_width + self.exit.x
+        steps = [step for _, step in cardinal_steps(self)]
+        reached, queue = {start}, collections.deque([start])
+        while queue:
+            current = queue.popleft()
+            for neighbor in (current + step for step in steps):
+                if 0 <= neighbor < len(trial) and not trial[neighbor] and neighbor not in reached:
+                    reached.add(neighbor)
+                    queue.append(neighbor)
+        return len(reached) == trial.count(0)
+
+
+def main():
+    """ Check mazes and time generation, per the command line """
+    mazes = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    for seed in range(0, mazes):
+        CheckedMaze(size, size, seed=seed)
+    print(f"{CheckedMaze.decisions} wall decisions in {mazes} {size}x{size} mazes, {CheckedMaze.wrong} wrong")
+    for generated in SIZES:
+        start = time.perf_counter()
+        Maze(generated, generated, True, 0)
+        print(f"{generated}x{generated}: {time.perf_counter() - start:.3f} s")
+    sys.exit(1 if CheckedMaze.wrong else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+""" juggling.assets:
+
+Images used by the lessons, loaded only when first asked for. Nothing is read from disk when the juggling package is
+imported, so the game logic (mazes, solvers, headless games) runs without pygame loading anything, e.g. in worker
+processes. Files are found relative to the package (in the repository's Related/ folder), not the current directory,
+and once there is a display every image is converted to its pixel format, which makes blitting it much faster.
+
+Scaled and rotated copies of the images (sprites) are kept too, such that drawing a player at the same size as last
+frame does not scale it again. The most recently used of them are kept, up to SPRITE_BYTES of pixels in all.
+
+    image("ship")  # The red spaceship, scaled and turned to face right
+    sprite("player", (32, 32))  # The player, 32 pixels square
+"""
+import collections
+import os
+
+# Folder the image files live in, next to the juggling package
+ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Related")
+
+
+def _ship(image):
+    """ The ship image is scaled down and turned to face along the x axis """
+    import pygame
+    return pygame.transform.rotate(pygame.transform.scale(image, (100, 100)), 90)
+
+
+# Asset name: (file in ROOT, function making the final image from the loaded file or None)
+ASSETS = {
+    "wall": ("wall.png", None),
+    "path": ("path.png", None),
+    "exit": ("exit.png", None),
+    "player": ("player1.png", None),
+    "ton": ("ton.png", None),
+    "ship": ("spaceship_red.png", _ship),
+}
+# Loaded images by asset name, and the names of those already converted to the display's format
+LOADED = {}
+CONVERTED = set()
+# Sprites by (asset, size, angle), least recently used first, and the bytes of pixels they hold
+SPRITES = collections.OrderedDict()
+SPRITE_BYTES = 32 * 1024 * 1024
+sprite_bytes = 0
+
+
+def register(name, file_name, transform=None):
+    """ Add an image to the registry, file_name being relative to ROOT unless absolute """
+    ASSETS[name] = (file_name, transform)
+    LOADED.pop(name, None)
+    CONVERTED.discard(name)
+    for key in [key for key in SPRITES if key[0] == name]:
+        forget(key)
+
+
+def path(file_name):
+    """ Full path of a file in ROOT """
+    return os.path.join(ROOT, file_name)
+
+
+def image(name):
+    """ Get the named image, loading it the first time
+
+    The image is converted to the display's pixel format as soon as there is a display to convert it to. Surfaces are
+    returned as they are, so wherever an image is wanted either an asset name or a Surface may be given.
+    """
+    if not isinstance(name, str):
+        return name
+    import pygame
+    if name not in LOADED:
+        file_name, transform = ASSETS[name]
+        loaded = pygame.image.load(path(file_name))
+        LOADED[name] = loaded if transform is None else transform(loaded)
+    if name not in CONVERTED and pygame.display.get_init() and pygame.display.get_surface() is not None:
+        LOADED[name] = LOADED[name].convert_alpha()
+        CONVERTED.add(name)
+    return LOADED[name]
+
+
+def forget(key):
+    """ Drop a sprite from the cache """
+    global sprite_bytes
+    made = SPRITES.pop(key)
+    sprite_bytes -= made.get_width() * made.get_height() * made.get_bytesize()
+
+
+def sprite(name, size=None, angle=0):
+    """ Get the named image (or a Surface) scaled to size (width, height) then turned angle degrees counterclockwise
+
+    Sprites are made in the display's pixel format and kept for next time, evicting the least recently used once they
+    hold more than SPRITE_BYTES. A sprite too large for that on its own is not kept. Until there is a display sprites
+    are made every time, since they could not be converted yet.
+    """
+    global sprite_bytes
+    key = (name, size, angle)
+    if key in SPRITES:
+        SPRITES.move_to_end(key)
+        return SPRITES[key]
+    import pygame
+    made = image(name)
+    made = made if size is None or made.get_size() == size else pygame.transform.scale(made, size)
+    made = made if angle == 0 else pygame.transform.rotate(made, angle)
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        made = made.convert_alpha()
+        size_bytes = made.get_width() * made.get_height() * made.get_bytesize()
+        if size_bytes <= SPRITE_BYTES:
+            SPRITES[key], sprite_bytes = made, sprite_bytes + size_bytes
+            while sprite_bytes > SPRITE_BYTES:
+                forget(next(iter(SPRITES)))
+    return made
@@ -0,0 +1,277 @@
+""" chunked.py
+
+Mazes too large to hold in memory. A ChunkedMaze is split into square chunks of cells, each one generated the first
+time one of its cells is looked at and forgotten again once no player is near it. A chunk is generated from the maze's
+seed and its own coordinates alone, so a forgotten chunk comes back exactly as it was, and a maze of millions of cells
+only ever holds the few chunks around its players.
+
+Each chunk is a lattice maze of its own (see juggling.generators), with a doorway through its left and top edges into
+the chunks next to it. The doorways make loops between chunks, but every cell is still reachable from the exit.
+
+    game = ChunkedGame(Difficulty.ASTAR, PLAYER, width=2001, height=2001, seed=7)
+
+Only the view around the player is drawn. Flood filling (Difficulty.HARD and VERY_HARD) needs the whole maze, so the
+hunters of a chunked game search instead: A* (Difficulty.ASTAR) is the best fit, its cost growing with the distance to
+the player and not the size of the maze.
+"""
+import collections
+import random
+import threading
+
+import juggling
+from .maze import Game, Cell, CompactCell, Player, Generator
+from .utilities import CellType, FloodFill, lazy_import, cardinal_steps
+
+lazy_import("juggling.pygame")
+
+WALL, PATH, EXIT = CellType.WALL.value, CellType.PATH.value, CellType.EXIT.value
+
+
+class IndexView(object):
+    """ Stands in for a flat table (y * full_width + x) too large to build, working out each entry when asked for it """
+
+    def __init__(self, function):
+        self.function = function
+
+    def __getitem__(self, index):
+        return self.function(index)
+
+
+class ChunkedCell(Cell):
+    """ A cell of a chunked maze, a view of one spot in the maze like CompactCell. Chunked mazes cannot be changed. """
+
+    def __init__(self, maze, x, y):
+        self.maze = maze
+        self.x = x
+        self.y = y
+
+    @property
+    def coordinates(self):
+        """ Coordinates of this cell """
+        return self.x, self.y
+
+    @property
+    def type(self):
+        """ Type of this cell, from the chunk it is in """
+        return CompactCell.TYPES[self.maze.type_value(self.y * self.maze.full_width + self.x)]
+
+
+class ChunkedMaze(object):
+    """ A maze made a chunk at a time, as its cells are looked at
+
+    Chunks are chunk x chunk cells, kept as flat bytearrays of cell types (y * chunk + x). The most recently used limit
+    of them are kept, and forget drops those far from every player. Solvers see the same flat indices as in a Maze
+    (y * full_width + x), with walkable and adjacency working out each entry when it is asked for.
+    """
+    # Cells across a chunk, even such that the rooms of neighboring chunks line up
+    CHUNK = 32
+    LIMIT = 256
+    # Generators that can make a chunk, those joining up the rooms of a lattice
+    LATTICE = (Generator.KRUSKAL, Generator.BACKTRACKER, Generator.WILSON)
+
+    def __init__(self, width, height, seed=None, chunk=CHUNK, limit=LIMIT, generator=Generator.KRUSKAL):
+        """ Make a maze, generating none of it yet. Without a seed one is chosen, as chunks are remade from it. """
+        if chunk < 2 or chunk % 2:
+            raise ValueError(f"Chunks must be an even number of cells across, not {chunk}")
+        elif generator not in self.LATTICE:
+            raise ValueError(f"{generator.name} cannot make chunks, only {[item.name for item in self.LATTICE]} can")
+        self.width = width
+        self.height = height
+        self.full_width = width + 2
+        self.full_height = height + 2
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.chunk = chunk
+        self.limit = limit
+        self.generator = generator
+        # Chunks by (x, y) chunk coordinates, least recently used first
+        self.chunks = collections.OrderedDict()
+        self.lock = threading.Lock()
+        # Chunked mazes never change, see Maze.revision
+        self.revision = 0
+        self._directions = {step: direction for direction, step in cardinal_steps(self)}
+        self._moves = [tuple(step for bit, (_, step) in enumerate(cardinal_steps(self)) if mask >> bit & 1)
+                       for mask in range(0, 16)]
+        # Steps to the cells up, down, left and right, as flat indices of the maze and of a chunk
+        self._steps = [(step, direction.value[1] * chunk + direction.value[0])
+                       for direction, step in cardinal_steps(self)]
+        self.exit = ChunkedCell(self, 0, random.Random(f"{self.seed}:exit").randrange(1, height + 1, 2))
+
+    def __getitem__(self, item):
+        """ Get the map cell at given coordinates """
+        x, y = (item.x, item.y) if isinstance(item, (Cell, Player)) else item
+        # Clamp values onto map's range
+        x = max(0, min(x, self.full_width - 1))
+        y = max(0, min(y, self.full_height - 1))
+        return ChunkedCell(self, x, y)
+
+    def __len__(self):
+        """ Number of cells in the maze, border included """
+        return self.full_width * self.full_height
+
+    def cell_type(self, x, y):
+        """ Type of the cell at x, y """
+        return CompactCell.TYPES[self.type_value(y * self.full_width + x)]
+
+    def type_value(self, index):
+        """ Type value of the cell at flat index (y * full_width + x) """
+        y, x = divmod(index, self.full_width)
+        return self.load_chunk(x // self.chunk, y // self.chunk)[(y % self.chunk) * self.chunk + x % self.chunk]
+
+    def walkable(self):
+        """ Stands in for Maze.walkable: 1 for cells that can be walked and 0 for walls, by flat index """
+        return IndexView(lambda index: int(self.type_value(index) != WALL))
+
+    def adjacency(self):
+        """ Stands in for Maze.adjacency: the mask of the directions open from each cell, by flat index """
+        return IndexView(self.open_mask)
+
+    def moves(self):
+        """ Steps in flat indices to the neighbors open in each mask of adjacency, by mask (see Maze.moves) """
+        return self._moves
+
+    def open_mask(self, index):
+        """ Mask of the directions open from the cell at flat index, bit i for the i-th of up, down, left and right
+
+        The neighbors of a cell inside its chunk are read from that chunk alone. Only cells on the edge of a chunk look
+        their neighbors up one by one, as those may be in the next chunk.
+        """
+        y, x = divmod(index, self.full_width)
+        (chunk_y, inner_y), (chunk_x, inner_x) = divmod(y, self.chunk), divmod(x, self.chunk)
+        types, inner = self.load_chunk(chunk_x, chunk_y), inner_y * self.chunk + inner_x
+        if types[inner] == WALL:
+            return 0
+        elif 0 < inner_x < self.chunk - 1 and 0 < inner_y < self.chunk - 1:
+            return sum(1 << bit for bit, (_, chunk_step) in enumerate(self._steps) if types[inner + chunk_step] != WALL)
+        # The border is all walls but the exit, so a step off either side of a row lands on a wall
+        return sum(1 << bit for bit, (step, _) in enumerate(self._steps)
+                   if 0 <= index + step < len(self) and self.type_value(index + step) != WALL)
+
+    def neighbors(self, index):
+        """ Flat indices of the walkable cells up, down, left and right of the cell at flat index """
+        return tuple(index + step for step in self._moves[self.open_mask(index)])
+
+    def direction(self, index, neighbor):
+        """ Direction of the step from the cell at flat index to the neighboring cell at flat index neighbor """
+        return self._directions[neighbor - index]
+
+    def load_chunk(self, x, y):
+        """ Cell types of the chunk at chunk coordinates x, y, generating it when not already held """
+        with self.lock:
+            if (x, y) in self.chunks:
+                self.chunks.move_to_end((x, y))
+                return self.chunks[(x, y)]
+            types = self.chunks[(x, y)] = self.generate_chunk(x, y)
+            while len(self.chunks) > self.limit:
+                self.chunks.popitem(last=False)
+            return types
+
+    def generate_chunk(self, x, y):
+        """ Generate the chunk at chunk coordinates x, y from the seed
+
+        The chunk owns its top row and left column, the walls between it and the chunks above and to the left, and
+        opens one doorway through each. Its rooms are those of the maze's lattice that fall inside it.
+        """
+        size = self.chunk
+        rng = random.Random(f"{self.seed}:{x}:{y}")
+        types = bytearray([WALL]) * (size * size)
+        width, height = min(size - 1, self.width - x * size), min(size - 1, self.height - y * size)
+        if width < 1 or height < 1:
+            return types
+        joined, joined_width = self.generator.value.generator.join(width, height, rng), width + 2
+        for row in range(0, min(height + 2, size)):
+            types[row * size:row * size + min(joined_width, size)] = \
+                joined[row * joined_width:row * joined_width + min(joined_width, size)]
+        if x > 0:
+            types[rng.randrange(1, height + 1, 2) * size] = PATH
+        if y > 0:
+            types[rng.randrange(1, width + 1, 2)] = PATH
+        if x == 0 and y == self.exit.y // size:
+            types[(self.exit.y % size) * size] = EXIT
+        return types
+
+    def forget(self, positions, radius=2):
+        """ Drop the chunks more than radius chunks away from all of the given (x, y) positions """
+        near = [(x // self.chunk, y // self.chunk) for x, y in positions]
+        with self.lock:
+            for key in [key for key in self.chunks
+                        if all(max(abs(key[0] - x), abs(key[1] - y)) > radius for x, y in near)]:
+                del self.chunks[key]
+
+
+class ChunkedGame(Game):
+    """ A game in a ChunkedMaze, drawing only the view cells around the player
+
+    The player starts anywhere in the maze and the hunters start within a chunk of the player, such that the hunt
+    does not begin a world away. After each turn the chunks far from every player are forgotten.
+    """
+    # Cells across the view drawn around the player
+    VIEW = 25
+
+    def __init__(self, difficulty, player, width=1001, height=1001, seed=None, chunk=ChunkedMaze.CHUNK,
+                 limit=ChunkedMaze.LIMIT, generator=Generator.KRUSKAL, view=VIEW, **kwargs):
+        """ Set up a game in a new chunked maze. Hunters must search (e.g. Difficulty.ASTAR), not flood fill. """
+        if isinstance(difficulty.value, FloodFill):
+            raise ValueError(f"{difficulty.name} flood fills the whole maze, use Difficulty.ASTAR in a chunked maze")
+        maze = ChunkedMaze(width, height, seed, chunk, limit, generator)
+        super().__init__(difficulty, player, maze=maze, seed=seed, **kwargs)
+        # The view moves with the player, so there is no background to redraw only parts of
+        self.dirty_rects = False
+        self.view = view
+
+    def choose_start(self, avoid, fairness=5, radius=None):
+        """ Choose a start location
+
+        Unlike Game.choose_start, which avoids a score, the maze has no scores and avoid is a cell or player. The start
+        is at least fairness steps (up, down, left and right) from it, and within radius cells of it when given.
+        """
+        radius = max(self.maze.width, self.maze.height) if radius is None else radius
+        x_range = (max(1, avoid.x - radius), min(self.maze.width, avoid.x + radius))
+        y_range = (max(1, avoid.y - radius), min(self.maze.height, avoid.y + radius))
+        for _ in range(0, 10000):
+            x, y = self.random.randint(*x_range), self.random.randint(*y_range)
+            if self.maze.cell_type(x, y) == CellType.WALL or abs(x - avoid.x) + abs(y - avoid.y) < fairness:
+                continue
+            return x, y
+        else:
+            raise Exception("Failed to find fair start location in 10000 iterations.")
+
+    def start(self):
+        """ Start all players """
+        self.player.start(self.choose_start(self.maze.exit))
+        for hunter in self.ai_players:
+            hunter.start(self.choose_start(self.player, radius=self.maze.chunk))
+        self.cheater.reset(self.player)
+        self.last = self.get_ticks()
+
+    def turn(self):
+        """ Play the turn, then forget the chunks no player is near """
+        super().turn()
+        self.maze.forget([(player.x, player.y) for player in self.players()])
+
+    def view_size(self):
+        """ Columns and rows of cells drawn """
+        return min(self.view, self.maze.full_width), min(self.view, self.maze.full_height)
+
+    def view_origin(self):
+        """ Cell drawn at the top left, such that the player is in the middle of the view where possible """
+        columns, rows = self.view_size()
+        return (max(0, min(self.player.x - columns // 2, self.maze.full_width - columns)),
+                max(0, min(self.player.y - rows // 2, self.maze.full_height - rows)))
+
+    def get_cell_size(self, window):
+        """ Size of the cells such that the view fits the window """
+        columns, rows = self.view_size()
+        width, height = window.get_size()
+        return min(width // (columns + 2), height // (rows + 2))
+
+    def draw_maze(self, window):
+        """ Draw the view around the player """
+        window.fill(juggling.pygame.COLORS["black"])
+        cell_size = self.get_cell_size(window)
+        columns, rows = self.view_size()
+        self.origin = left, top = self.view_origin()
+        window.blits([(juggling.pygame.tile(self.maze.cell_type(x, y), cell_size),
+                       ((x - left + 1) * cell_size, (y - top + 1) * cell_size))
+                      for y in range(top, top + rows) for x in range(left, left + columns)], doreturn=False)
+        [player.draw(window, cell_size, origin=self.origin) for player in self.players()
+         if left <= player.x < left + columns and top <= player.y < top + rows]
@@ -3,7 +3,10 @@
 Sets up the data/positions for the ship-based lessons. This is just to remove code duplication and keep the lessons
 clean.  Not much has changed here since our original pygame lessons.
 """
-from juggling.pygame import SHIP_IMAGE
+from array import array
+
+from juggling import assets
+from juggling.utilities import numpy
 
 
 class Ship(object):
@@ -19,9 +22,19 @@ class Ship(object):
         """ Builds the object """
         self.ready = True  # Ready to run flag
         self.position = (0, y_position)
-        self.image = SHIP_IMAGE
+        self.image = "ship"
         self.thread = None # Assigned only in the thread lesson (part 2)
 
+    @property
+    def image(self):
+        """ The ship's image, looked up when drawn such that it is in the display's format once there is a display """
+        return assets.image(self._image)
+
+    @image.setter
+    def image(self, image):
+        """ Set the image, an asset name or a Surface """
+        self._image = image
+
     def draw(self, window):
         """ Draw the ship data into the window
 
@@ -30,3 +43,50 @@ class Ship(object):
         """
         window.blit(self.image, self.position)
 
+
+class ShipFleet(object):
+    """ Data package for many ships at once, e.g. thousands of them in a stress scene
+
+    Rather than one Ship object per ship, the fleet keeps every ship's position and velocity in contiguous arrays
+    (numpy arrays when numpy is installed, python arrays otherwise). Moving the fleet is then one array operation
+    instead of a python loop, and drawing it is a single Surface.blits call. All the ships share one image (an asset
+    name or a Surface), scaled to size once.
+    """
+    def __init__(self, y_positions, velocities=None, image="ship", size=None):
+        """ Builds the fleet, starting each ship at x = 0 and the given y, moving right by its velocity (1 default) """
+        self.image = image
+        self.size = size
+        velocities = velocities if velocities is not None else [1.0] * len(y_positions)
+        if numpy is not None:
+            self.x = numpy.zeros(len(y_positions))
+            self.y = numpy.array(y_positions, dtype=float)
+            self.velocity = numpy.array(velocities, dtype=float)
+        else:
+            self.x = array("d", [0.0]) * len(y_positions)
+            self.y = array("d", y_positions)
+            self.velocity = array("d", velocities)
+
+    def __len__(self):
+        """ Number of ships in the fleet """
+        return len(self.x)
+
+    def position(self, index):
+        """ Position of one ship """
+        return self.x[index], self.y[index]
+
+    def move(self, wrap=None):
+        """ Move every ship by its velocity, wrapping back to x = 0 past wrap if given """
+        if numpy is not None:
+            self.x += self.velocity
+            if wrap is not None:
+                numpy.mod(self.x, wrap, out=self.x)
+            return
+        for index, velocity in enumerate(self.velocity):
+            self.x[index] = (self.x[index] + velocity) % wrap if wrap is not None else self.x[index] + velocity
+
+    def draw(self, window):
+        """ Draw the whole fleet into the window with one blits call """
+        # The sprite is in the display's pixel format, which matters when blitting the same image thousands of times
+        image = assets.sprite(self.image, self.size)
+        xs, ys = (self.x.tolist(), self.y.tolist()) if numpy is not None else (self.x, self.y)
+        window.blits([(image, position) for position in zip(xs, ys)], doreturn=False)
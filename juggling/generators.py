@@ -0,0 +1,208 @@
+""" generators.py
+
+Ways of generating a maze other than dropping random walls (see Maze._walls), chosen with juggling.maze.Generator.
+Each one makes the flat cell types (y * full_width + x) of a width x height maze with its border, carving paths rather
+than testing walls, so every open cell is reachable from the exit by construction.
+
+The lattice generators (Kruskal, Backtracker and Wilson) lay the maze out as rooms on the odd (x, y) cells, with the
+cells between two rooms either a wall or a doorway. Caves grows caves out of noise with a cellular automaton instead.
+"""
+import abc
+import collections
+
+from .utilities import CellType
+
+WALL, PATH, EXIT = CellType.WALL.value, CellType.PATH.value, CellType.EXIT.value
+
+
+class Lattice(object):
+    """ Rooms on the odd cells of a maze, each one a step of 2 away from the next """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.full_width = width + 2
+        self.full_height = height + 2
+        self.rooms = [y * self.full_width + x for y in range(1, height + 1, 2) for x in range(1, width + 1, 2)]
+        self.room_set = set(self.rooms)
+        self.steps = [-2, 2, -2 * self.full_width, 2 * self.full_width]
+
+    def walls(self):
+        """ Cell types with every cell a wall """
+        return bytearray([WALL]) * (self.full_width * self.full_height)
+
+    def neighbors(self, room):
+        """ Rooms next to room """
+        x = room % self.full_width
+        return [room + step for step in self.steps
+                if room + step in self.room_set and (abs(step) != 2 or 1 <= x + step <= self.width)]
+
+    @staticmethod
+    def carve(types, room, neighbor):
+        """ Open both rooms and the cell between them """
+        types[room] = types[neighbor] = types[(room + neighbor) // 2] = PATH
+
+
+def place_exit(types, width, height, rng):
+    """ Put the exit on the left or right border, next to an open cell, and return its flat index """
+    full_width = width + 2
+    doors = [y * full_width for y in range(1, height + 1) if types[y * full_width + 1] != WALL]
+    doors += [y * full_width + width + 1 for y in range(1, height + 1) if types[y * full_width + width] != WALL]
+    door = rng.choice(doors)
+    types[door] = EXIT
+    return door
+
+
+class Carver(abc.ABC):
+    """ A lattice generator, joining up the rooms of a Lattice """
+
+    def cells(self, width, height, rng):
+        """ Cell types of a new width x height maze """
+        types = self.join(width, height, rng)
+        place_exit(types, width, height, rng)
+        return types
+
+    @abc.abstractmethod
+    def join(self, width, height, rng):
+        """ Cell types of a width x height maze with every room joined up, but no exit """
+
+
+class Kruskal(Carver):
+    """ Randomized Kruskal's algorithm
+
+    Knock down the walls between rooms in a random order, skipping any wall whose rooms are already joined. Which rooms
+    are joined is tracked with a union-find.
+    """
+
+    def join(self, width, height, rng):
+        """ Cell types of a width x height maze with every room joined up, but no exit """
+        lattice = Lattice(width, height)
+        types = lattice.walls()
+        groups = {room: room for room in lattice.rooms}
+        for room in lattice.rooms:
+            types[room] = PATH
+        doors = [(room, neighbor) for room in lattice.rooms for neighbor in lattice.neighbors(room) if neighbor > room]
+        rng.shuffle(doors)
+        for room, neighbor in doors:
+            first, second = self.group(groups, room), self.group(groups, neighbor)
+            if first != second:
+                groups[first] = second
+                lattice.carve(types, room, neighbor)
+        return types
+
+    @staticmethod
+    def group(groups, room):
+        """ Find the group of joined rooms containing room, halving the path walked as we go """
+        while groups[room] != room:
+            groups[room] = groups[groups[room]]
+            room = groups[room]
+        return room
+
+
+class Backtracker(Carver):
+    """ Recursive backtracker
+
+    Walk to a random unvisited room, carving as you go, and back up when stuck. The walk is kept on an explicit stack,
+    so large mazes do not run into the recursion limit.
+    """
+
+    def join(self, width, height, rng):
+        """ Cell types of a width x height maze with every room joined up, but no exit """
+        lattice = Lattice(width, height)
+        types = lattice.walls()
+        if lattice.rooms:
+            start = rng.choice(lattice.rooms)
+            types[start] = PATH
+            stack = [start]
+            while stack:
+                unvisited = [neighbor for neighbor in lattice.neighbors(stack[-1]) if types[neighbor] == WALL]
+                if not unvisited:
+                    stack.pop()
+                    continue
+                neighbor = rng.choice(unvisited)
+                lattice.carve(types, stack[-1], neighbor)
+                stack.append(neighbor)
+        return types
+
+
+class Wilson(Carver):
+    """ Wilson's algorithm
+
+    From each room not yet in the maze, walk at random until reaching the maze, then carve the walk with its loops
+    erased. Every maze is as likely as any other. The walks take more than one step per room on average, by however
+    long a random walk takes to find the maze.
+    """
+
+    def join(self, width, height, rng):
+        """ Cell types of a width x height maze with every room joined up, but no exit """
+        lattice = Lattice(width, height)
+        types = lattice.walls()
+        if lattice.rooms:
+            types[rng.choice(lattice.rooms)] = PATH
+            for room in lattice.rooms:
+                # Remember only the last step out of each room, which erases any loop the walk makes
+                exits = {}
+                current = room
+                while types[current] == WALL:
+                    exits[current] = rng.choice(lattice.neighbors(current))
+                    current = exits[current]
+                current = room
+                while types[current] == WALL:
+                    following = exits[current]
+                    types[current] = types[(current + following) // 2] = PATH
+                    current = following
+        return types
+
+
+class Caves(object):
+    """ Caves grown by a cellular automaton
+
+    Start from random noise and repeatedly make each cell a wall when most of the cells around it are walls. Only the
+    largest cave is kept, the rest are filled in, and a tunnel is dug from it to the left border when it does not reach
+    either side.
+    """
+
+    def __init__(self, fill=0.45, rounds=4):
+        self.fill = fill
+        self.rounds = rounds
+
+    def cells(self, width, height, rng):
+        """ Cell types of a new width x height maze """
+        full_width, full_height = width + 2, height + 2
+        interior = [y * full_width + x for y in range(1, height + 1) for x in range(1, width + 1)]
+        types = bytearray([WALL]) * (full_width * full_height)
+        for index in interior:
+            types[index] = WALL if rng.random() < self.fill else PATH
+        ring = [dy * full_width + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+        for _ in range(0, self.rounds):
+            walls = [sum(types[index + step] == WALL for step in ring) for index in interior]
+            for index, count in zip(interior, walls):
+                types[index] = WALL if count >= 5 else PATH if count <= 3 else types[index]
+        cave = self.largest_cave(types, interior, full_width)
+        if not cave:
+            cave = {interior[0]}
+        for index in interior:
+            types[index] = PATH if index in cave else WALL
+        if not any(index % full_width in (1, width) for index in cave):
+            start = min(cave, key=lambda index: index % full_width)
+            for index in range(start - start % full_width + 1, start):
+                types[index] = PATH
+        place_exit(types, width, height, rng)
+        return types
+
+    @staticmethod
+    def largest_cave(types, interior, full_width):
+        """ The largest group of open cells connected up, down, left and right, as a set of flat indices """
+        steps, seen, largest = [-1, 1, -full_width, full_width], set(), set()
+        for start in interior:
+            if types[start] == WALL or start in seen:
+                continue
+            cave, queue = {start}, collections.deque([start])
+            while queue:
+                current = queue.popleft()
+                for neighbor in (current + step for step in steps):
+                    if types[neighbor] != WALL and neighbor not in cave:
+                        cave.add(neighbor)
+                        queue.append(neighbor)
+            seen |= cave
+            largest = cave if len(cave) > len(largest) else largest
+        return largest
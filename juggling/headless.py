@@ -0,0 +1,60 @@
+""" headless.py
+
+Runs the maze game without a display, threads or a wall clock. Turns are counted on a logical clock and happen as fast
+as the CPU allows, such that thousands of games can be simulated to evaluate solvers or catch regressions.
+"""
+from .maze import Game, Player, ExternalControlPlayer
+
+
+class HeadlessGame(Game):
+    """ A game that runs one turn every time the player moves
+
+    Instead of a player thread waiting for the game to unblock it, a call to player.move finishes the turn right away:
+    the AI thinks, every player moves and the game checks for a winner, all on the caller's thread. A control function
+    written for the threaded game, like gwc_amazing_solution(player, game), plays a whole game when called. Games that
+    run past max_turns end as a TIMEOUT.
+    """
+    def __init__(self, difficulty, player=None, max_turns=1000, **kwargs):
+        """ Set up a game, with an ExternalControlPlayer unless given a player """
+        super().__init__(difficulty, player if player is not None else ExternalControlPlayer(), turn_time=0, **kwargs)
+        self.max_turns = max_turns
+        self.turns = 0
+
+    def get_ticks(self):
+        """ Logical time of the game: the number of turns played """
+        return self.turns
+
+    def start(self):
+        """ Place all players, without starting any threads """
+        Player.start(self.player, self.choose_start(0))
+        for hunter in self.ai_players:
+            Player.start(hunter, self.choose_start(self.maze[self.player].score))
+        self.cheater.reset(self.player)
+        self.last = self.get_ticks()
+
+    def stop(self):
+        """ Stop the game """
+        self.gameover.set()
+
+    def wait_turn(self, player):
+        """ Run the turn as soon as the player has moved, instead of waiting on the clock """
+        if player is self.player:
+            self.step()
+
+    def step(self):
+        """ Play one turn: the AI thinks, then every player moves """
+        if self.gameover.is_set():
+            return
+        for hunter in self.ai_players:
+            hunter.plan(hunter.think())
+        self.turn()
+        self.turns += 1
+        if self.turns >= self.max_turns:
+            self.gameover.set()
+
+    def play(self, control):
+        """ Play a whole game with the control function control(player, game), returning the outcome """
+        self.start()
+        control(self.player, self)
+        self.stop()
+        return self.outcome()
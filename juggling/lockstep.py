@@ -0,0 +1,108 @@
+""" lockstep.py
+
+Runs the maze game on a single thread. Instead of each player owning a thread that blocks in player.move until the
+game lets it go, each player's strategy is a generator that yields the Direction of its next move. Every turn the game
+asks each player for one move, then makes all the moves together: the players step in lockstep with no threads, locks
+or events to switch between.
+
+A generator strategy looks like the threaded ones, with yield in place of player.move:
+
+    def wall_hugger(player, game):
+        while True:
+            for direction in [Direction.LEFT, Direction.UP, Direction.DOWN, Direction.RIGHT]:
+                cell_type, has_enemy = player.look(direction)
+                if cell_type != CellType.WALL and not has_enemy:
+                    break
+            yield direction
+
+The thread-based Game and ExternalControlPlayer are unchanged and remain the way the lessons run.
+"""
+from .maze import Game, Player, Direction
+
+
+class GeneratorPlayer(Player):
+    """ A player controlled by a generator strategy, strategy(player, game), yielding one Direction per turn """
+
+    def __init__(self):
+        """ Generator controlled player """
+        super().__init__()
+        self.control = None
+        self.strategy = None
+
+    def set_control(self, function):
+        """ Set control function, a generator function taking (player, game) """
+        self.control = function
+
+    def start(self, item):
+        """ Set start location and start the strategy """
+        super().start(item)
+        self.strategy = self.control(self, self.game)
+
+    def next_move(self):
+        """ Run the strategy up to its next move. A strategy that has finished stays put. """
+        return next(self.strategy, None) or Direction.STAY
+
+    def stop(self):
+        """ Stop the strategy """
+        if self.strategy is not None:
+            self.strategy.close()
+
+
+class LockstepGame(Game):
+    """ A game that steps every player's move on the calling thread
+
+    Used with juggling.pygame.main like the threaded game (main(game.run, game)), a turn is stepped every turn_time
+    milliseconds. play() instead steps turns as fast as possible until the game ends or max_turns have been played.
+    """
+    def __init__(self, difficulty, player=None, turn_time=500, max_turns=None, **kwargs):
+        """ Set up a game, with a new GeneratorPlayer unless given one. Players that are not generator driven are
+        refused, as the game asks its player for moves instead of waiting on a thread.
+        """
+        if player is not None and not isinstance(player, GeneratorPlayer):
+            raise TypeError(f"LockstepGame needs a GeneratorPlayer, not {type(player).__name__}")
+        super().__init__(difficulty, player if player is not None else GeneratorPlayer(), turn_time, **kwargs)
+        self.max_turns = max_turns
+        self.turns = 0
+
+    def start(self):
+        """ Place all players and start their strategies, without starting any threads """
+        GeneratorPlayer.start(self.player, self.choose_start(0))
+        for hunter in self.ai_players:
+            Player.start(hunter, self.choose_start(self.maze[self.player].score))
+        self.cheater.reset(self.player)
+        self.last = self.get_ticks()
+
+    def stop(self):
+        """ Stop the game """
+        self.gameover.set()
+        self.player.stop()
+
+    def run(self):
+        """ Run the game, stepping a turn once it is time for one """
+        now = self.get_ticks()
+        if (now - self.last) < self.turn_time:
+            return
+        self.last = now
+        self.step()
+
+    def step(self):
+        """ Play one turn: ask every player for its move, then make them all """
+        if self.gameover.is_set():
+            return
+        self.player.plan(self.player.next_move())
+        for hunter in self.ai_players:
+            hunter.plan(hunter.think())
+        self.turn()
+        self.turns += 1
+        if self.max_turns is not None and self.turns >= self.max_turns:
+            self.gameover.set()
+
+    def play(self, control=None):
+        """ Play a whole game as fast as possible, setting the control function first if given. Returns the outcome """
+        if control is not None:
+            self.player.set_control(control)
+        self.start()
+        while not self.gameover.is_set():
+            self.step()
+        self.stop()
+        return self.outcome()
@@ -2,19 +2,38 @@
 
 Handling for mazes in the pygame context. This contains algorithms for generating and solving the maze.
 """
-import copy
+import collections
+import random
 import threading
+from array import array
 from enum import Enum
 from typing import Tuple, Union
 from random import randint
-import itertools
-import juggling.pygame
+import juggling
 
-import pygame
-from .utilities import Direction, CellType, RandomWalk, FloodFill
+from . import assets
+from .generators import Kruskal, Backtracker, Wilson, Caves
+from .utilities import Direction, CellType, Backend, RandomWalk, FloodFill, AStar, BidirectionalSearch, numpy, \
+    lazy_import, cardinal_steps
 
-PLAYER_IMAGE = pygame.image.load("Related/player1.png")
-TON_IMAGE = pygame.image.load("Related/ton.png")
+# Only drawing needs pygame, so neither is started up until something is drawn
+pygame = lazy_import("pygame")
+lazy_import("juggling.pygame")
+
+
+def __getattr__(name):
+    """ Images once loaded here on import, now loaded from juggling.assets when first used """
+    if name in ("PLAYER_IMAGE", "TON_IMAGE"):
+        return assets.image("player" if name == "PLAYER_IMAGE" else "ton")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class Outcome(Enum):
+    """ How a game ended """
+    WON = "won"
+    LOST = "lost"
+    CHEATED = "cheated"
+    TIMEOUT = "timeout"
 
 
 class Difficulty(Enum):
@@ -22,6 +41,39 @@ class Difficulty(Enum):
     EASY = RandomWalk()
     HARD = FloodFill(4)
     VERY_HARD = FloodFill(1)
+    ASTAR = AStar(1)
+    BIDIRECTIONAL = BidirectionalSearch(1)
+
+
+class RandomWalls(object):
+    """ Drop walls at random, keeping only those that leave every cell reachable (see Maze._walls) """
+
+    def generate(self, maze):
+        """ Generate the cells of the maze """
+        maze._allocate()
+        maze._borders()
+        maze.exit = maze._make_exit()
+        maze._walls()
+
+
+class Carved(object):
+    """ One of the generators of juggling.generators, which make the flat cell types of a whole maze at once """
+
+    def __init__(self, generator):
+        self.generator = generator
+
+    def generate(self, maze):
+        """ Generate the cells of the maze """
+        maze.load(self.generator.cells(maze.width, maze.height, maze.random or random))
+
+
+class Generator(Enum):
+    """ How a maze is generated. WALLS is the original way, the others carve a maze out (see juggling.generators). """
+    WALLS = RandomWalls()
+    KRUSKAL = Carved(Kruskal())
+    BACKTRACKER = Carved(Backtracker())
+    WILSON = Carved(Wilson())
+    CAVES = Carved(Caves())
 
 
 class Cell(object):
@@ -55,14 +107,13 @@ class Cell(object):
     def draw(self, window, cell_size, debug=False):
         """ """
         cell_type = self.type
-        drawable = juggling.pygame.IMAGES.get(cell_type, juggling.pygame.COLORS.get(cell_type, (255, 255, 255)))
         rect = pygame.Rect((self.x + 1) * cell_size, (self.y + 1) * cell_size, cell_size, cell_size)
-        # Draw the base cell, with a color or an image
-        if isinstance(drawable, tuple) and len(drawable) == 3:
-            pygame.draw.rect(window, drawable, rect)
-        elif isinstance(drawable, pygame.surface.Surface):
-            drawable = pygame.transform.scale(drawable, (cell_size, cell_size))
-            window.blit(drawable, ((self.x + 1) * cell_size, (self.y + 1) * cell_size))
+        # Draw the base cell, with an image or a color
+        if cell_type not in juggling.pygame.CELL_IMAGES:
+            pygame.draw.rect(window, juggling.pygame.COLORS.get(cell_type, (255, 255, 255)), rect)
+        else:
+            window.blit(juggling.pygame.tile(cell_type, cell_size),
+                        ((self.x + 1) * cell_size, (self.y + 1) * cell_size))
         attr = getattr(self, "score", None)
         if attr is not None and debug:
             text = juggling.pygame.FONT.render(str(attr), True, juggling.pygame.COLORS["white"],
@@ -72,8 +123,50 @@ class Cell(object):
         #pygame.draw.rect(window, juggling.pygame.COLORS["white"], rect, 2)
 
 
+class CompactCell(Cell):
+    """ A cell of a compact maze
+
+    Compact mazes do not hold cells. They keep the type and score of every cell in flat arrays, and hand out these
+    light views of one spot in those arrays, such that reading and writing a view's type or score reads and writes the
+    maze itself. Like a regular cell, a view has no score until one is set.
+    """
+    TYPES = {cell_type.value: cell_type for cell_type in CellType}
+
+    def __init__(self, maze, x, y):
+        self.maze = maze
+        self.x = x
+        self.y = y
+
+    @property
+    def coordinates(self):
+        """ Coordinates of this cell """
+        return self.x, self.y
+
+    @property
+    def type(self):
+        """ Type of this cell, as stored by the maze """
+        return self.TYPES[self.maze._types[self.y * self.maze.full_width + self.x]]
+
+    @type.setter
+    def type(self, cell_type):
+        self.maze._types[self.y * self.maze.full_width + self.x] = cell_type.value
+        self.maze.changed()
+
+    @property
+    def score(self):
+        """ Score of this cell, as stored by the maze """
+        score = self.maze._scores[self.y * self.maze.full_width + self.x]
+        if score < 0:
+            raise AttributeError(f"{self} has no score")
+        return score
+
+    @score.setter
+    def score(self, score):
+        self.maze._scores[self.y * self.maze.full_width + self.x] = score
+
+
 class Player(object):
-    def __init__(self, image=PLAYER_IMAGE):
+    def __init__(self, image="player"):
         self.x = 0
         self.y = 0
         self.game = None
@@ -97,22 +190,32 @@ class Player(object):
 
     def start(self, item):
         """ Start the player at the given cell """
-        self.x, self.y = (item.x, item.y) if isinstance(item, Cell) else item
+        self.place(*((item.x, item.y) if isinstance(item, Cell) else item))
+
+    def place(self, x, y):
+        """ Put the player at x, y, keeping the game's index of who is on which cell up to date (see Game.occupants) """
+        if self.game is not None:
+            self.game.moved(self, (self.x, self.y), (x, y))
+        self.x, self.y = x, y
 
     def look(self, direction: Direction):
         """ Retrieve cell in direction """
         next_cell = self.game.maze[self.game.maze[self] + direction]
-        return next_cell.type, Player.collided(self.game.ai_player, next_cell)
+        return next_cell.type, self.game.hunter_at(next_cell) is not None
 
     def get_scaled_image(self, cell_size):
-        """ Get a scaled image """
-        if self.image is None or self.image.get_size() != (cell_size, cell_size):
-            self.image = pygame.transform.scale(self.original_image, (cell_size, cell_size))
+        """ Get a scaled image, from the sprite cache """
+        self.image = assets.sprite(self.original_image, (cell_size, cell_size))
         return self.image
 
     def move(self, direction):
         """ Wait for the next round, then move """
-        # Wait for the next round, as called by the game, them immediately clear waiting state
+        self.plan(direction)
+        # Wait for the next round, as called by the game
+        self.game.wait_turn(self)
+
+    def plan(self, direction):
+        """ Set the move to make at the next update """
         current_cell = self.game.maze[self]
         new_cell = self.game.maze[current_cell + direction]
         with self.lock:
@@ -120,24 +223,21 @@ class Player(object):
                 self.next_x, self.next_y = new_cell.x, new_cell.y
             else:
                 self.next_x, self.next_y = self.x, self.y
-        self.waiting.wait()
-        self.waiting.clear()
 
     def update(self):
         """ Update the position now """
         with self.lock:
             if self.next_x is not None and self.next_y is not None:
-                self.x = self.next_x
-                self.y = self.next_y
+                self.place(self.next_x, self.next_y)
 
     def unblock(self):
         self.waiting.set()
 
-    def draw(self, window, cell_size, image_size=None):
-        """ Draw a player """
-        x, y = self.x, self.y
-        window.blit(self.get_scaled_image(cell_size if image_size is None else image_size),
-                    ((x + 1) * cell_size, (y + 1) * cell_size))
+    def draw(self, window, cell_size, image_size=None, origin=(0, 0)):
+        """ Draw a player, origin being the maze cell drawn at the top left, returning the rectangle drawn """
+        x, y = self.x - origin[0], self.y - origin[1]
+        return window.blit(self.get_scaled_image(cell_size if image_size is None else image_size),
+                           ((x + 1) * cell_size, (y + 1) * cell_size))
 
     @staticmethod
     def collided(item1, item2):
@@ -153,16 +253,26 @@ class AiPlayer(Player):
 
     def __init__(self, difficulty):
         """"""
-        super().__init__(image=TON_IMAGE)
+        super().__init__(image="ton")
         self.difficulty = difficulty
+        self.turns = 0
         self.thread = threading.Thread(target=self.hunter_thread)
 
     def hunter_thread(self):
         """ Hunt the player until we are told to stop """
         while not self.game.gameover.is_set():
-            position, maze, goal = self.game.maze[self], self.game.maze, self.game.player
-            move = self.difficulty.value.next(position, maze, goal)
-            self.move(move)
+            self.move(self.think())
+
+    def think(self):
+        """ Choose the next move toward the player, thinking once every difficulty.value.thinking turns
+
+        Each hunter counts its own turns, as the difficulty (and whatever it has worked out) is shared by every hunter.
+        """
+        solver, move = self.difficulty.value, Direction.STAY
+        if self.turns % solver.thinking == 0:
+            move = solver.think(self.game.maze[self], self.game.maze, self.game.player)
+        self.turns += 1
+        return move
 
     def start(self, item):
         """ Start this player """
@@ -174,7 +284,7 @@ class ExternalControlPlayer(Player):
 
     def __init__(self):
         """ Externally controlled player """
-        super().__init__(PLAYER_IMAGE)
+        super().__init__("player")
         self.thread = None
 
     def set_control(self, function):
@@ -193,16 +303,43 @@ class Maze(object):
     The maze class consists of a 2D array of cells as shown above. These cells represent the type of the maze, where
     PATHs can be walked, WALLs cannot, and the EXIT (singular) is the goal
 
+    A compact maze stores the same information in flat arrays (y * full_width + x) instead: a bytearray of cell types
+    and an array of scores (-1 for no score). It hands out CompactCell views of those arrays, uses a few bytes per cell
+    rather than a few hundred and copies as a couple of buffer copies.
+
+    A maze given a seed draws its random numbers from its own random.Random, so the same seed (and size) always makes
+    the same maze. Without one (random is None) it uses the random module like the rest of the game.
     """
-    def __init__(self, width, height):
-        """ """
+    # Steps to the 8 cells surrounding a cell, clockwise from the top left. Odd entries are the cardinal directions.
+    RING = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0)]
+    # What a new wall fares against each arrangement of walls around it (see _wall_runs), made on first use
+    RUNS = None
+
+    def __init__(self, width, height, compact=False, seed=None, cell_types=None, generator=Generator.WALLS):
+        """ Make a maze, generating it with generator unless given the type values of its cells (see cell_types) """
         self.width = width
         self.height = height
         self.full_width = width + 2
         self.full_height = height + 2
+        self.compact = compact
+        self.seed = seed
+        self.random = random.Random(seed) if seed is not None else None
+        self.generator = generator
         self._map = None
+        self._types = None
+        self._scores = None
+        self._walkable = None
+        self._adjacency = None
+        # Direction of each step between neighboring flat indices, and the steps open from a cell (see adjacency)
+        self._directions = {step: direction for direction, step in cardinal_steps(self)}
+        self._moves = [tuple(step for bit, (_, step) in enumerate(cardinal_steps(self)) if mask >> bit & 1)
+                       for mask in range(0, 16)]
         self.exit = None
-        self.randomize()
+        self.revision = 0
+        if cell_types is None:
+            self.randomize()
+        else:
+            self.load(cell_types)
 
     def __getitem__(self, item: Union[Cell, Tuple[int, int]]):
         """ Get the map cell at given coordinates """
@@ -210,7 +347,13 @@ class Maze(object):
         # Clamp values onto map's range
         x = max(0, min(x, self.full_width - 1))
         y = max(0, min(y, self.full_height - 1))
-        return self._map[y][x]
+        return CompactCell(self, x, y) if self.compact else self._map[y][x]
+
+    def __getstate__(self):
+        """ Copies (and pickles) leave out what is worked out from the cells, which is made again on first use """
+        state = dict(self.__dict__)
+        state["_walkable"] = state["_adjacency"] = None
+        return state
 
     def __iter__(self):
         """ Iterate this object """
@@ -224,12 +367,107 @@ class Maze(object):
         """ Calculates the length of this range"""
         return int(self.full_width * self.full_height)
 
+    def changed(self):
+        """ Mark the maze as changed, such that anything worked out from the old maze is recomputed
+
+        Compact cells do this whenever their type is set. Call it after setting the type of a regular cell by hand.
+        """
+        self.revision += 1
+        self._walkable = None
+        self._adjacency = None
+
+    def walkable(self):
+        """ Flat bytearray (y * full_width + x) that is 1 for cells that can be walked and 0 for walls """
+        if self._walkable is None:
+            self._walkable = bytearray(cell_type != CellType.WALL.value for cell_type in self.cell_types())
+        return self._walkable
+
+    def adjacency(self):
+        """ Walkable neighbors of every cell, as a flat bytearray (y * full_width + x) of masks of the open directions
+
+        Bit i of a cell's mask is set when the cell and the cell the i-th of up, down, left and right of it are both
+        walkable, so walls have no bits set. moves()[mask] holds the steps in flat indices to those neighbors, such that
+        searches step through them instead of adding Directions to cells and clamping them back onto the maze:
+
+            for step in moves[adjacency[index]]:
+                neighbor = index + step
+
+        A byte per cell, built on first use after the maze was made or changed. The whole table is worked out at once
+        by treating the walkable bytes as one large integer: shifting it by a step's bytes lines each cell up with its
+        neighbor. Off the left or right of a row lands on the border, which is walls but for the exit.
+        """
+        if self._adjacency is None:
+            walkable = self.walkable()
+            whole, mask = int.from_bytes(walkable, "little"), 0
+            for bit, (_, step) in enumerate(cardinal_steps(self)):
+                shifted = whole >> (8 * step) if step > 0 else whole << (8 * -step)
+                # Each byte is 0 or 1, so moving it up bit places can never carry into the next byte
+                mask |= (whole & shifted) << bit
+            mask &= (1 << (8 * len(walkable))) - 1
+            self._adjacency = bytearray(mask.to_bytes(len(walkable), "little"))
+        return self._adjacency
+
+    def moves(self):
+        """ Steps in flat indices to the neighbors open in each mask of adjacency, by mask """
+        return self._moves
+
+    def neighbors(self, index):
+        """ Flat indices of the walkable cells next to the cell at flat index (see adjacency) """
+        return tuple(index + step for step in self._moves[self.adjacency()[index]])
+
+    def direction(self, index, neighbor):
+        """ Direction of the step from the cell at flat index to the neighboring cell at flat index neighbor """
+        return self._directions[neighbor - index]
+
+    def cell_types(self):
+        """ Flat buffer of the type value of every cell (y * full_width + x) """
+        if self.compact:
+            return self._types
+        return bytearray(cell.type.value for row in self._map for cell in row)
+
+    def scores(self):
+        """ Flat array of the score of every cell (y * full_width + x), -1 for no score """
+        if self.compact:
+            return self._scores
+        return array("i", (getattr(cell, "score", -1) for row in self._map for cell in row))
+
+    def set_scores(self, scores):
+        """ Set the score of every cell from a flat sequence (y * full_width + x) """
+        if self.compact:
+            self._scores[:] = array("i", scores)
+            return
+        for cell, score in zip((cell for row in self._map for cell in row), scores):
+            cell.score = int(score)
+
+    def _allocate(self):
+        """ Make a fresh set of cells, all PATH with no score """
+        if self.compact:
+            self._types = bytearray([CellType.PATH.value]) * len(self)
+            self._scores = array("i", [-1]) * len(self)
+        else:
+            self._map = [[Cell(x, y) for x in range(0, self.full_width)] for y in range(0, self.full_height)]
+
+    @property
+    def algorithm(self):
+        """ Name of the way the maze is generated, part of what identifies a maze alongside its size and seed """
+        return self.generator.name.lower()
+
     def randomize(self):
-        """ Randomize the map using some algorithm """
-        self._map = [[Cell(x, y) for x in range(0, self.full_width)] for y in range(0, self.full_height)]
-        self._borders()
-        self.exit = self._make_exit()
-        self._walls()
+        """ Randomize the map using the maze's generator """
+        self.generator.value.generate(self)
+        self.changed()
+
+    def load(self, cell_types):
+        """ Replace the maze with the one given by the type value of every cell (y * full_width + x), see cell_types """
+        self._allocate()
+        if self.compact:
+            self._types[:] = bytes(cell_types)
+        else:
+            for cell, cell_type in zip((cell for row in self._map for cell in row), cell_types):
+                cell.type = CellType(cell_type)
+        exit_index = bytes(cell_types).index(CellType.EXIT.value)
+        self.exit = self[exit_index % self.full_width, exit_index // self.full_width]
+        self.changed()
 
     def _borders(self):
         """ Draw boarders on the map """
@@ -242,6 +480,7 @@ class Maze(object):
 
     def _make_exit(self):
         """ Choose randomize exit """
+        randint = (self.random or random).randint
         random_x = randint(1, self.width)
         random_y = randint(1, self.height)
 
@@ -254,33 +493,102 @@ class Maze(object):
         cell.type = CellType.EXIT
         return cell
 
-    def _test_wall(self, coord):
-        """ """
-        test_cell = self[coord]
-        # Don't double up a wall
-        if test_cell.type != CellType.PATH:
-            return False
-        # Count the number of neighbor walls and avoid more than
-        neighbor_steps = itertools.product((-1, 0, 1), (-1, 0, 1))
-        nearby_count = len([step for step in neighbor_steps if self[test_cell + step].type == CellType.WALL])
-        if nearby_count > 3:
+    @staticmethod
+    def _wall_runs(mask):
+        """ How a new wall fares against the 8 cells around it, given which of them are walls (bit i for RING[i])
+
+        Returns None when the new wall would touch more than 3 walls. Otherwise returns a ring position in each run of
+        walls that separates two of the open cells up, down, left or right of the new wall. Consecutive ring cells are
+        always next to each other, so the open cells of the ring fall into arcs, and only arcs holding one of those 4
+        cells meet the new wall. An open corner between two walls is an arc of its own that does not, and the walls on
+        either side of it touch diagonally, so they count as one run.
+        """
+        walls = [bool(mask >> position & 1) for position in range(0, 8)]
+        if walls.count(True) > 3:
+            return None
+        elif not any(walls):
+            return ()
+        first = walls.index(True)
+        arcs, runs, arc = 0, [], []
+        for position in [(first + offset) % 8 for offset in range(1, 9)]:
+            if not walls[position]:
+                arc.append(position)
+                continue
+            # Arcs of corners alone do not meet the new wall
+            if any(cell % 2 for cell in arc):
+                arcs, runs = arcs + 1, runs + [position]
+            arc = []
+        return tuple(runs) if arcs > 1 else ()
+
+    def _wall_fits(self, wall, walls, index, ring_steps):
+        """ Whether a wall fits at index, given the walls so far (1 in the flat bytearray wall) and their groups """
+        s0, s1, s2, s3, s4, s5, s6, s7 = ring_steps
+        mask = (wall[index + s0] | wall[index + s1] << 1 | wall[index + s2] << 2 | wall[index + s3] << 3 |
+                wall[index + s4] << 4 | wall[index + s5] << 5 | wall[index + s6] << 6 | wall[index + s7] << 7)
+        runs = self.RUNS[mask]
+        if runs is None:
             return False
-        # Finally, set the wall and test that it is solvable
-        annotated_maze = copy.deepcopy(self)
-        annotated_maze[test_cell].type = CellType.WALL
-        annotated_maze = FloodFill.cache(annotated_maze, False)
-        for cell in annotated_maze:
-            output = FloodFill.recursive_walker(annotated_maze, annotated_maze[cell])
-            if cell.type == CellType.PATH and output is None:
-                return False
-        return True
+        return not runs or len({self._wall_group(walls, index + ring_steps[run]) for run in runs}) == len(runs)
+
+    @staticmethod
+    def _wall_group(walls, index):
+        """ Find the group of touching walls containing index, halving the path walked as we go """
+        while walls[index] != index:
+            walls[index] = walls[walls[index]]
+            index = walls[index]
+        return index
 
     def _walls(self):
-        """ Randomize walls """
+        """ Randomize walls
+
+        Walls are tested against a flat grid instead of the cells themselves, such that the test for each candidate
+        only touches the cells around it. Walkable cells connect up/down/left/right, so walls block them when touching
+        in any of the 8 directions. A new wall cuts off some walkable cells exactly when it would close a loop of
+        walls, that is when two of the runs of walls around it separating the cells it touches (see _wall_runs)
+        already belong to the same group of touching walls. Walls tracks those groups as a union-find (see
+        _wall_group): the border is one group to start with, and each placed wall joins the groups of the walls it
+        touches. What runs there are depends only on which of the 8 cells are walls, so it is looked up in RUNS (see
+        _wall_fits).
+
+        Adding walls never makes a rejected cell acceptable, so rejected cells are marked in the grid (2) and not
+        tested again. The walls are written to the maze once all are placed.
+        """
+        if Maze.RUNS is None:
+            Maze.RUNS = [self._wall_runs(mask) for mask in range(0, 256)]
+        wall_group = self._wall_group
+        # Type values to grid values (EXIT and PATH are walkable, WALL is not) and back for the placed walls
+        to_grid, to_types = bytes([1, 1, 0]).ljust(256, b"\0"), bytes([0, CellType.WALL.value]).ljust(256, b"\0")
+        if self.compact:
+            grid = bytearray(self._types.translate(to_grid))
+        else:
+            grid = bytearray(cell.type.value for row in self._map for cell in row).translate(to_grid)
+        # 1 for walls, the opposite of the grid, such that the walls around a cell are read as a mask
+        wall = grid.translate(bytes([1, 0]).ljust(256, b"\0"))
+        border = grid.index(0)
+        walls = [index if walkable else border for index, walkable in enumerate(grid)]
+        ring_steps = [dy * self.full_width + dx for dx, dy in self.RING]
+        uniform, width, full_width = (self.random or random).random, self.width, self.full_width
+        cells = self.width * self.height
         for _ in range(0, len(self)):
-            coord = (randint(1, self.width), randint(1, self.height))
-            if self._test_wall(coord):
-                self[coord].type = CellType.WALL
+            y, x = divmod(int(uniform() * cells), width)
+            index = (y + 1) * full_width + x + 1
+            if grid[index] != 1:
+                continue
+            elif not self._wall_fits(wall, walls, index, ring_steps):
+                grid[index] = 2
+                continue
+            grid[index], wall[index] = 0, 1
+            # The new wall is a group of its own (walls[index] is index) until it joins the walls it touches
+            for step in ring_steps:
+                if wall[index + step]:
+                    walls[wall_group(walls, index + step)] = index
+        if self.compact:
+            # WALL is the largest type value, so it wins wherever a wall was placed
+            self._types[:] = bytes(map(max, self._types, wall.translate(to_types)))
+            return
+        for cell, walled in zip((cell for row in self._map for cell in row), wall):
+            if walled:
+                cell.type = CellType.WALL
 
 
 class CheatDetector(object):
@@ -288,10 +596,14 @@ class CheatDetector(object):
 
     def __init__(self, player, maze):
         """ Detects cheats, with magic """
-        self.exit_copy = copy.deepcopy(maze.exit)
+        self.exit_copy = maze.exit.coordinates
         self.last = (0, 0)
         self.max_movement = 0
 
+    def reset(self, player):
+        """ Start watching the player from where it is now, e.g. once placed at its start """
+        self.last = player.x, player.y
+
     def update(self, player, ai_players):
         """ Update from ai and plauers """
         change = abs(player.x - self.last[0]) + abs(player.y - self.last[1])
@@ -308,28 +620,79 @@ class CheatDetector(object):
 
 
 class Game(object):
-    """ Create the GAME in all its glory """
-    def __init__(self, difficulty: Difficulty, player, turn_time=500):
+    """ Create the GAME in all its glory
+
+    A game given a seed makes its maze from that seed and chooses the start locations with its own random.Random, so
+    the same seed always sets up the same game. The maze is made by the given Generator, the original random walls by
+    default.
+
+    There may be any number of hunters (AiPlayers), all of the same difficulty and all chasing the player. Hunters of a
+    FloodFill difficulty share its distance maps, so each turn the maze is flooded once toward the player however many
+    hunters there are.
+    """
+    # Pixels the winner grows by at a time on the game over screen
+    GROWTH = 8
+
+    def __init__(self, difficulty: Difficulty, player, turn_time=500, width=12, height=12, compact=False,
+                 backend=Backend.PYTHON, dirty_rects=False, maze=None, seed=None, hunters=1,
+                 generator=Generator.WALLS):
         self.gameover = threading.Event()
         self.gameover_counter = None
-        self.maze = FloodFill.cache(Maze(12, 12), False)
+        self.dirty_rects = dirty_rects
+        self.background = None
+        self.background_key = None
+        self.drawn = []
+        # Maze cell drawn at the top left of the window, moved by games that only draw part of the maze
+        self.origin = (0, 0)
+        self.backend = backend.check()
+        self.random = random.Random(seed) if seed is not None else random
+        # Players never change the maze, so a maze already cached by FloodFill.cache may be shared between games
+        if maze is None:
+            maze = FloodFill.cache(Maze(width, height, compact, seed, generator=generator), False, backend)
+        self.maze = maze
         self.last = None
         self.turn_time = turn_time
         self.player = player
-        self.ai_player = AiPlayer(difficulty)
+        self.ai_players = [AiPlayer(difficulty) for _ in range(0, hunters)]
+        # Players on each cell, by (x, y), kept up to date as players are placed (see Player.place)
+        self.occupants = collections.defaultdict(list)
         for player in self.players():
             player.set_game(self)
+            self.occupants[(player.x, player.y)].append(player)
         self.cheater = CheatDetector(self.player, self.maze)
-        self.cheater.update(player, self.ai_player)
+        self.cheater.update(self.player, self.ai_players)
+
+    @property
+    def ai_player(self):
+        """ The first hunter, the only one unless the game was made with more """
+        return self.ai_players[0]
 
     def players(self):
         """ Returns list of players """
-        return [self.player, self.ai_player]
+        return [self.player] + self.ai_players
+
+    def moved(self, player, old, new):
+        """ Move a player from the old to the new (x, y) in the occupants index """
+        if player in self.occupants.get(old, ()):
+            self.occupants[old].remove(player)
+            if not self.occupants[old]:
+                del self.occupants[old]
+        self.occupants[new].append(player)
+
+    def hunter_at(self, item):
+        """ A hunter at the given cell, player or coordinates, None if there is none """
+        x, y = (item.x, item.y) if isinstance(item, (Cell, Player)) else item
+        for occupant in self.occupants.get((x, y), ()):
+            if isinstance(occupant, AiPlayer):
+                return occupant
+        return None
 
     def choose_start(self, avoid, fairness=5):
         """ Choose a start location """
+        if self.backend == Backend.NUMPY:
+            return self._choose_start_vectorized(avoid, fairness)
         for _ in range(0, 10000):
-            x, y = randint(1, self.maze.width), randint(1, self.maze.height)
+            x, y = self.random.randint(1, self.maze.width), self.random.randint(1, self.maze.height)
             cell = self.maze[x, y]
             if cell.type == CellType.WALL or abs(cell.score - avoid) < fairness:
                 continue
@@ -337,11 +700,34 @@ class Game(object):
         else:
             raise Exception("Failed to find fair start location in 10000 iterations.")
 
+    def _choose_start_vectorized(self, avoid, fairness):
+        """ Choose a start location among all fair cells at once, using numpy """
+        shape = (self.maze.full_height, self.maze.full_width)
+        types = numpy.frombuffer(self.maze.cell_types(), dtype=numpy.uint8).reshape(shape)
+        scores = numpy.asarray(self.maze.scores(), dtype=numpy.int64).reshape(shape)
+        fair = (types != CellType.WALL.value) & (numpy.abs(scores - avoid) >= fairness)
+        ys, xs = numpy.nonzero(fair[1:self.maze.height + 1, 1:self.maze.width + 1])
+        if len(xs) == 0:
+            raise Exception("Failed to find fair start location in the maze.")
+        choice = self.random.randint(0, len(xs) - 1)
+        return int(xs[choice]) + 1, int(ys[choice]) + 1
+
     def start(self):
         """ Start all players """
         self.player.start(self.choose_start(0))
-        self.ai_player.start(self.choose_start(self.maze[self.player].score))
-        self.last = pygame.time.get_ticks()
+        for hunter in self.ai_players:
+            hunter.start(self.choose_start(self.maze[self.player].score))
+        self.cheater.reset(self.player)
+        self.last = self.get_ticks()
+
+    def get_ticks(self):
+        """ Current time of the game, in milliseconds """
+        return pygame.time.get_ticks()
+
+    def wait_turn(self, player):
+        """ Block a player until the game unblocks it for the next turn, then immediately clear waiting state """
+        player.waiting.wait()
+        player.waiting.clear()
 
     def stop(self):
         """ Stop the game """
@@ -354,21 +740,40 @@ class Game(object):
     def run(self):
         """ Run the game """
         # Check if it is time for a step
-        now = pygame.time.get_ticks()
+        now = self.get_ticks()
         if (now - self.last) < self.turn_time:
             return
         self.last = now
+        self.turn()
+        for player in self.players():
+            player.unblock()
+
+    def turn(self):
+        """ Make the moves every player has planned and check for the end of the game
+
+        Only the player that just moved can have made a catch, so the player looks up the hunters on its cell (see
+        occupants) and each hunter is checked against the player alone.
+        """
         for player in self.players():
             player.update()
             if Player.collided(self.player, self.maze.exit):
                 self.gameover.set()
                 break
-            if Player.collided(self.player, self.ai_player):
+            caught = self.hunter_at(self.player) if player is self.player else Player.collided(self.player, player)
+            if caught:
                 self.gameover.set()
                 break
-        self.cheater.update(self.player, self.ai_player)
-        for player in self.players():
-            player.unblock()
+        self.cheater.update(self.player, self.ai_players)
+
+    def outcome(self):
+        """ How the game ended, None while it is still going """
+        if not self.gameover.is_set():
+            return None
+        elif Player.collided(self.player, self.maze.exit):
+            return Outcome.CHEATED if self.cheater.cheated(self) else Outcome.WON
+        elif self.hunter_at(self.player) is not None:
+            return Outcome.LOST
+        return Outcome.TIMEOUT
 
     def get_cell_size(self, window):
         """ """
@@ -380,15 +785,21 @@ class Game(object):
         return min(width // cell_counts_horizontal, height // cell_counts_vertical)
 
     def draw(self, window):
-        """ Draw the maze """
+        """ Draw the maze
+
+        Returns the list of rectangles changed when only those need updating on screen (see dirty_rects), and None when
+        the whole window should be updated.
+        """
         # Draw maze if no winners
-        if not self.gameover.is_set():
+        if not self.gameover.is_set() and self.dirty_rects:
+            return self.draw_maze_dirty(window)
+        elif not self.gameover.is_set():
             self.draw_maze(window)
         # Check and draw winners no more .won flag as it inspired cheating
         elif self.gameover.is_set() and Player.collided(self.player, self.maze.exit) and not self.cheater.cheated(self):
             self.draw_game_over("You Won!!!", self.player, window)
-        elif self.gameover.is_set() and Player.collided(self.player, self.ai_player):
-            self.draw_game_over("You Lost!!!", self.ai_player, window)
+        elif self.gameover.is_set() and self.hunter_at(self.player) is not None:
+            self.draw_game_over("You Lost!!!", self.hunter_at(self.player), window)
         else:
             self.draw_cheater(window)
 
@@ -400,6 +811,30 @@ class Game(object):
         [cell.draw(window, cell_size) for cell in self.maze]
         [player.draw(window, cell_size) for player in self.players()]
 
+    def draw_maze_dirty(self, window):
+        """ Maze drawing that only redraws what changed
+
+        The maze itself is drawn once to a background surface, and again only when the window size or the maze
+        changes. Each frame the background is copied back over where the players were and the players are drawn where
+        they are now, so the cost of a frame does not depend on the size of the maze.
+        """
+        cell_size = self.get_cell_size(window)
+        key = (window.get_size(), self.maze.revision)
+        if self.background_key != key:
+            self.background = pygame.Surface(window.get_size())
+            self.background.fill(juggling.pygame.COLORS["black"])
+            [cell.draw(self.background, cell_size) for cell in self.maze]
+            self.background_key, self.drawn = key, []
+            window.blit(self.background, (0, 0))
+            self.drawn = [(player.x, player.y, player.draw(window, cell_size)) for player in self.players()]
+            return [window.get_rect()]
+        elif [(x, y) for x, y, _ in self.drawn] == [(player.x, player.y) for player in self.players()]:
+            return []
+        dirty = [rect for _, _, rect in self.drawn]
+        [window.blit(self.background, rect, rect) for rect in dirty]
+        self.drawn = [(player.x, player.y, player.draw(window, cell_size)) for player in self.players()]
+        return dirty + [rect for _, _, rect in self.drawn]
+
     def draw_cheater(self, window):
         """ Cheater? """
         self.gameover_counter = (0 if self.gameover_counter is None else self.gameover_counter) + 1
@@ -415,7 +850,9 @@ class Game(object):
         cell_size = self.get_cell_size(window)
         window.fill(juggling.pygame.COLORS["black"])
         self.gameover_counter = (self.gameover_counter if self.gameover_counter is not None else cell_size) + 1
-        winner.draw(window, cell_size, self.gameover_counter)
+        # Grow in steps of GROWTH up to the size of the window, such that the winner is scaled a bounded number of times
+        image_size = min(self.gameover_counter - self.gameover_counter % self.GROWTH, *window.get_size())
+        winner.draw(window, cell_size, max(cell_size, image_size), self.origin)
         text = juggling.pygame.FONT_END.render(text, True, juggling.pygame.COLORS["white"],
                                                juggling.pygame.COLORS["black"])
         window.blit(text, (300, 300))
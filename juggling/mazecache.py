@@ -0,0 +1,71 @@
+""" mazecache.py
+
+Mazes kept on disk, such that a seeded maze is generated (and flood filled) once and loaded after that. A maze made
+from a seed is always the same maze, so it is stored under a name worked out from what makes it: its width, height,
+seed and the generator that made it (see Maze.algorithm). Along with the cells the file holds the maze's distance
+field, the score of every cell as left by FloodFill.cache.
+
+    maze = load_maze(12, 12, seed=7)  # Generated the first time, read from the cache every time after
+
+The cache lives in ~/.cache/juggling unless the JUGGLING_CACHE environment variable names another directory.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from array import array
+
+from .maze import Maze, Generator
+from .utilities import FloodFill
+
+# Bump when the file layout or the maze made from a seed changes, such that old files are not read as new ones
+VERSION = 2
+DIRECTORY = os.environ.get("JUGGLING_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "juggling"))
+
+
+def key(width, height, seed, algorithm="walls"):
+    """ Name of the cache file of a maze, a hash of everything that decides what the maze is """
+    identity = json.dumps([VERSION, width, height, seed, algorithm, array("i").itemsize])
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def path(width, height, seed, algorithm="walls", directory=None):
+    """ Full path of the cache file of a maze """
+    return os.path.join(directory or DIRECTORY, key(width, height, seed, algorithm) + ".maze")
+
+
+def save_maze(maze, directory=None):
+    """ Write a seeded maze and its scores to the cache
+
+    The file is written to a temporary name and renamed into place, so processes sharing the cache never read half a
+    file.
+    """
+    if maze.seed is None:
+        raise ValueError("Only seeded mazes can be cached, as a maze without a seed cannot be made again")
+    directory = directory or DIRECTORY
+    os.makedirs(directory, exist_ok=True)
+    header = {"width": maze.width, "height": maze.height, "seed": maze.seed, "algorithm": maze.algorithm}
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(handle, "wb") as file_handle:
+        file_handle.write(json.dumps(header).encode("utf-8") + b"\n")
+        file_handle.write(bytes(maze.cell_types()))
+        file_handle.write(maze.scores().tobytes())
+    os.replace(temporary, path(maze.width, maze.height, maze.seed, maze.algorithm, directory))
+
+
+def load_maze(width, height, seed, compact=False, directory=None, generator=Generator.WALLS):
+    """ Get the maze made from seed with its scores, from the cache when there, otherwise generating and caching it """
+    cached = path(width, height, seed, generator.name.lower(), directory)
+    if not os.path.exists(cached):
+        maze = FloodFill.cache(Maze(width, height, compact, seed, generator=generator), False)
+        save_maze(maze, directory)
+        return maze
+    with open(cached, "rb") as file_handle:
+        file_handle.readline()
+        cells = (width + 2) * (height + 2)
+        cell_types = file_handle.read(cells)
+        scores = array("i")
+        scores.frombytes(file_handle.read())
+    maze = Maze(width, height, compact, seed, cell_types, generator)
+    maze.set_scores(scores)
+    return maze
@@ -0,0 +1,142 @@
+""" juggling.profiler:
+
+Opt-in frame profiler for the pygame loop. Pass a FrameProfiler to juggling.pygame.main (or set the JUGGLING_PROFILE
+environment variable to a .csv or .json file name) and every frame is split into its phases: move, draw, events and
+tick (the time clock.tick spends waiting for the next frame). Any method of any object can be timed as its own phase
+too, e.g. profiler.instrument(GAME, "turn", "draw_maze") to see how much of a frame the game logic and the maze
+drawing take.
+
+The last few seconds of frames are kept to give rolling percentiles, frames that took too long to keep up with the
+frame rate are counted as dropped, and the numbers can be drawn on screen and/or written out when the loop ends. When no
+profiler is given nothing here runs at all.
+"""
+import collections
+import csv
+import functools
+import json
+import time
+
+import pygame
+
+PERCENTILES = (50, 90, 99)
+
+
+class Timer(object):
+    """ Times one phase of a frame, used as "with profiler.phase(name):" """
+    def __init__(self, samples):
+        self.samples = samples
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *_):
+        self.samples.append(time.perf_counter() - self.start)
+
+
+class FrameProfiler(object):
+    """ Collects per-phase times of each frame of a pygame loop """
+    def __init__(self, fps=60, window=300, overlay=False, dump=None):
+        """ Profile frames of a loop targeting fps, keeping the last window frames for the percentiles
+
+        :param fps: frame rate the loop is trying to keep, frames taking more than 1.5 frames are counted as dropped
+        :param window: number of recent samples the percentiles are taken over
+        :param overlay: draw the numbers over the top left corner of the window
+        :param dump: file to write the report to once the loop ends, as json if it ends in .json and csv otherwise
+        """
+        self.budget = 1.0 / fps
+        self.window = window
+        self.overlay = overlay
+        self.dump = dump
+        self.samples = collections.OrderedDict()
+        self.timers = {}
+        self.frames = 0
+        self.dropped = 0
+        self.last = None
+        self.font = None
+
+    def phase(self, name):
+        """ Context manager timing the named phase """
+        if name not in self.timers:
+            self.samples[name] = collections.deque(maxlen=self.window)
+            self.timers[name] = Timer(self.samples[name])
+        return self.timers[name]
+
+    def frame(self):
+        """ Mark the start of a frame, measuring the whole of the frame before it """
+        now = time.perf_counter()
+        if self.last is not None:
+            self.phase("frame").samples.append(now - self.last)
+            self.frames += 1
+            if now - self.last > 1.5 * self.budget:
+                self.dropped += 1
+        self.last = now
+
+    def instrument(self, item, *names):
+        """ Time the named methods of item as phases of their own, named like "Game.turn" """
+        for name in names:
+            setattr(item, name, self.timed(getattr(item, name), f"{type(item).__name__}.{name}"))
+        return item
+
+    def timed(self, function, name):
+        """ Wrap function such that each call is timed as the named phase """
+        timer = self.phase(name)
+
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            with timer:
+                return function(*args, **kwargs)
+        return timed_function
+
+    def percentiles(self, name):
+        """ Rolling percentiles of a phase, in milliseconds """
+        ordered = sorted(self.samples.get(name, ()))
+        if not ordered:
+            return {}
+        last = len(ordered) - 1
+        return {percent: 1000 * ordered[min(last, len(ordered) * percent // 100)] for percent in PERCENTILES}
+
+    def report(self):
+        """ Everything measured, as a dictionary """
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "phases": {
+                name: {f"p{percent}_ms": value for percent, value in self.percentiles(name).items()}
+                for name in self.samples
+            }
+        }
+
+    def write(self, path):
+        """ Write the report to path, as json if it ends in .json and as csv (one row per phase) otherwise """
+        report = self.report()
+        with open(path, "w", newline="") as file_handle:
+            if path.endswith(".json"):
+                json.dump(report, file_handle, indent=2)
+                return
+            writer = csv.writer(file_handle)
+            writer.writerow(["phase"] + [f"p{percent}_ms" for percent in PERCENTILES] + ["frames", "dropped"])
+            for name, values in report["phases"].items():
+                writer.writerow([name] + [f"{values.get(f'p{percent}_ms', 0):.3f}" for percent in PERCENTILES] +
+                                [report["frames"], report["dropped"]])
+
+    def finish(self):
+        """ Called once the loop ends, writing the report if asked to """
+        if self.dump is not None:
+            self.write(self.dump)
+
+    def draw(self, window):
+        """ Draw the numbers over the top left corner of the window, returning the rectangle drawn """
+        if self.font is None:
+            self.font = pygame.font.SysFont("monospace", 16)
+        lines = [f"frames {self.frames}  dropped {self.dropped}"] + [
+            f"{name:<14} " + " ".join(f"p{percent} {value:6.2f}" for percent, value in self.percentiles(name).items())
+            for name in self.samples
+        ]
+        images = [self.font.render(line, True, (255, 255, 255), (0, 0, 0)) for line in lines]
+        height = self.font.get_linesize()
+        rect = pygame.Rect(0, 0, max(image.get_width() for image in images), height * len(images))
+        window.fill((0, 0, 0), rect)
+        for number, image in enumerate(images):
+            window.blit(image, (0, number * height))
+        return [rect]
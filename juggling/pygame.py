@@ -1,5 +1,9 @@
 
+import asyncio
+import os
 import pygame
+from . import assets
+from .profiler import FrameProfiler
 from .utilities import CellType
 
 from random import randint
@@ -13,17 +17,15 @@ COLORS = {
     CellType.PATH: (0, 0, 0),
     CellType.EXIT: (0, 255, 0)
 }
-IMAGES = {
-    CellType.WALL: pygame.image.load("Related/wall.png"),
-    CellType.PATH: pygame.image.load("Related/path.png"),
-    CellType.EXIT: pygame.image.load("Related/exit.png")
+# Cell types drawn with an image, by asset name (see juggling.assets). IMAGES gives the images themselves.
+CELL_IMAGES = {
+    CellType.WALL: "wall",
+    CellType.PATH: "path",
+    CellType.EXIT: "exit"
 }
 
 
 FPS = 60
-# Images
-SHIP_IMAGE = pygame.image.load("Related/spaceship_red.png")
-SHIP_IMAGE = pygame.transform.rotate(pygame.transform.scale(SHIP_IMAGE, (100, 100)), 90)
 
 FONT, FONT_END = None, None
 
@@ -31,6 +33,15 @@ FONT, FONT_END = None, None
 RUN = True
 
 
+def __getattr__(name):
+    """ Images once loaded here on import, now loaded from juggling.assets when first used """
+    if name == "IMAGES":
+        return {cell_type: assets.image(asset) for cell_type, asset in CELL_IMAGES.items()}
+    elif name == "SHIP_IMAGE":
+        return assets.image("ship")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def setup(caption="You Forgot to Set A Caption, Michael..."):
     """ Sets up pygame's display etc. """
     global FONT, FONT_END
@@ -49,27 +60,92 @@ def events():
             RUN = False
 
 
+def tile(cell_type, cell_size):
+    """ Get the image of a cell type scaled to the cell size, scaling it only the first time it is asked for """
+    return assets.sprite(CELL_IMAGES[cell_type], (cell_size, cell_size))
+
+
 def draw(window, *items):
     """ Update the scene from two positions
 
-    Compose the scene into the given window and a list of positions of ships that you want to draw.
+    Compose the scene into the given window and a list of positions of ships that you want to draw. Items whose draw
+    returns a list of the rectangles they changed only get those rectangles updated on screen. If any item returns
+    anything else (like None), the whole window is updated.
 
     :param window: window to draw the scene into
     :param items: any number of data items used to draw ships
     """
     #window.fill(COLORS["black"])
-    for item in items:
-        item.draw(window)
-    pygame.display.update()
+    changed = [item.draw(window) for item in items]
+    if all(isinstance(rects, list) for rects in changed):
+        pygame.display.update([rect for rects in changed for rect in rects])
+    else:
+        pygame.display.update()
 
 
-def main(move, *items):
-    """ Main program """
+def main(move, *items, profiler=None):
+    """ Main program
+
+    A FrameProfiler given as profiler (or made when the JUGGLING_PROFILE environment variable names a file to write to)
+    times each phase of every frame, see juggling.profiler.
+    """
     window, clock = setup()
+    if profiler is None and os.environ.get("JUGGLING_PROFILE"):
+        profiler = FrameProfiler(FPS, dump=os.environ["JUGGLING_PROFILE"])
+    if profiler is None:
+        while RUN:
+            move()
+            draw(window, *items)
+            events()
+            clock.tick(FPS)
+        pygame.quit()
+        return
+    items = items + (profiler,) if profiler.overlay else items
+    while RUN:
+        profiler.frame()
+        with profiler.phase("move"):
+            move()
+        with profiler.phase("draw"):
+            draw(window, *items)
+        with profiler.phase("events"):
+            events()
+        with profiler.phase("tick"):
+            clock.tick(FPS)
+    profiler.finish()
+    pygame.quit()
+
+
+async def main_async(move, *items, controllers=()):
+    """ Main program, as an asyncio event loop
+
+    Works like main, except that nothing here blocks. The frame rate is kept by awaiting asyncio.sleep instead of
+    clock.tick, such that other tasks run in between frames. Controllers are coroutines (e.g. ship1(SHIP_1) where ship1
+    is an "async def" function) run as tasks alongside the frames, and they await asyncio.sleep to slow themselves down
+    without slowing anything else. Move may be an async function too, in which case it runs as a task and is only
+    started again once the last call has finished, so a slow move never holds up drawing.
 
+    :param move: function (or async function) called every frame
+    :param items: any number of data items to draw
+    :param controllers: coroutines to run until the window is closed, cancelled if still running then
+    """
+    window, _ = setup()
+    loop = asyncio.get_running_loop()
+    tasks = [asyncio.ensure_future(controller) for controller in controllers]
+    moving = None
     while RUN:
-        move()
+        start = loop.time()
+        if moving is None or moving.done():
+            result = move()
+            moving = asyncio.ensure_future(result) if asyncio.iscoroutine(result) else None
         draw(window, *items)
         events()
-        clock.tick(FPS)
+        await asyncio.sleep(max(0.0, 1 / FPS - (loop.time() - start)))
+    for task in tasks + ([moving] if moving is not None else []):
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
     pygame.quit()
+
+
+def run_async(move, *items, controllers=()):
+    """ Run main_async in a new asyncio event loop until the window is closed """
+    asyncio.run(main_async(move, *items, controllers=controllers))
@@ -0,0 +1,142 @@
+""" tournament.py
+
+Evaluates maze solvers, functions like gwc_amazing_solution(player, game) from Juggling-Part3.py, against each
+difficulty. Every (solver, difficulty) pair plays the same N seeded headless games, spread across a pool of processes,
+and the wins, losses and turn counts are gathered into a results table.
+
+    python -m juggling.tournament Juggling-Part3.py:gwc_amazing_solution --games 200 --output results.csv
+
+Solvers are named "file.py:function" or "module:function" such that every process can load them.
+"""
+import argparse
+import collections
+import csv
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import random
+
+from .headless import HeadlessGame
+from .maze import Difficulty, Outcome
+from .mazecache import load_maze
+
+# Solvers already loaded by this process, by name
+SOLVERS = {}
+COLUMNS = ["solver", "difficulty", "games", "won", "lost", "cheated", "timeout", "win_rate", "mean_turns",
+           "mean_turns_to_win"]
+
+
+def load_solver(name):
+    """ Load a solver from "path/to/file.py:function" or "package.module:function" """
+    if name not in SOLVERS:
+        source, function = name.rsplit(":", 1)
+        if source.endswith(".py"):
+            spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(source))[0], source)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        else:
+            module = importlib.import_module(source)
+        SOLVERS[name] = getattr(module, function)
+    return SOLVERS[name]
+
+
+def play(task):
+    """ Play one seeded game, returning (solver, difficulty, outcome, turns)
+
+    The maze and the start locations come from the seed, and the random module is seeded with it too before the game is
+    played, so any random choices are the same for every solver given the same seed. Mazes are generated once and then
+    loaded from the maze cache (see juggling.mazecache). The solver is loaded first, as loading a lesson may well use
+    random itself.
+    """
+    solver, difficulty, seed, width, height, max_turns = task
+    control = load_solver(solver)
+    random.seed(seed)
+    game = HeadlessGame(Difficulty[difficulty], max_turns=max_turns, maze=load_maze(width, height, seed), seed=seed)
+    outcome = game.play(control)
+    return solver, difficulty, outcome.name, game.turns
+
+
+def summarize(results):
+    """ Gather game results into one row per (solver, difficulty) """
+    games = collections.defaultdict(list)
+    for solver, difficulty, outcome, turns in results:
+        games[(solver, difficulty)].append((outcome, turns))
+    rows = []
+    for (solver, difficulty), played in games.items():
+        outcomes = collections.Counter(outcome for outcome, _ in played)
+        wins = [turns for outcome, turns in played if outcome == Outcome.WON.name]
+        rows.append({
+            "solver": solver,
+            "difficulty": difficulty,
+            "games": len(played),
+            "won": outcomes[Outcome.WON.name],
+            "lost": outcomes[Outcome.LOST.name],
+            "cheated": outcomes[Outcome.CHEATED.name],
+            "timeout": outcomes[Outcome.TIMEOUT.name],
+            "win_rate": round(len(wins) / len(played), 4),
+            "mean_turns": round(sum(turns for _, turns in played) / len(played), 2),
+            "mean_turns_to_win": round(sum(wins) / len(wins), 2) if wins else None,
+        })
+    return sorted(rows, key=lambda row: (row["solver"], list(Difficulty.__members__).index(row["difficulty"])))
+
+
+def run_tournament(solvers, difficulties=None, games=100, seed=0, processes=None, width=12, height=12,
+                   max_turns=1000):
+    """ Play games seeded games of every solver against every difficulty across a process pool
+
+    :param solvers: solver names, see load_solver
+    :param difficulties: Difficulty members to play against, all of them by default
+    :param games: number of games per (solver, difficulty), seeded seed, seed + 1, ...
+    :param processes: size of the process pool, one per CPU by default
+    :return: one summary row (a dictionary with the COLUMNS) per (solver, difficulty)
+    """
+    difficulties = difficulties if difficulties is not None else list(Difficulty)
+    tasks = [(solver, difficulty.name, seed + game, width, height, max_turns)
+             for solver in solvers for difficulty in difficulties for game in range(0, games)]
+    chunk_size = max(1, len(tasks) // ((processes or os.cpu_count() or 1) * 8))
+    with multiprocessing.Pool(processes) as pool:
+        results = list(pool.imap_unordered(play, tasks, chunksize=chunk_size))
+    return summarize(results)
+
+
+def write_results(rows, path):
+    """ Write summary rows to a CSV file """
+    with open(path, "w", newline="") as file_handle:
+        writer = csv.DictWriter(file_handle, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_results(rows):
+    """ Print summary rows as a table """
+    widths = {column: max([len(column)] + [len(str(row[column])) for row in rows]) for column in COLUMNS}
+    print("  ".join(column.rjust(widths[column]) for column in COLUMNS))
+    for row in rows:
+        print("  ".join(str(row[column]).rjust(widths[column]) for column in COLUMNS))
+
+
+def main():
+    """ Run a tournament from the command line """
+    parser = argparse.ArgumentParser(description="Evaluate maze solvers against each difficulty")
+    parser.add_argument("solvers", nargs="+", help="solvers as file.py:function or module:function")
+    parser.add_argument("--difficulty", action="append", choices=list(Difficulty.__members__),
+                        help="difficulty to play against, may be repeated (default: all)")
+    parser.add_argument("--games", type=int, default=100, help="games per solver and difficulty")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--size", type=int, nargs=2, default=(12, 12), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--max-turns", type=int, default=1000, help="turns before a game is a timeout")
+    parser.add_argument("--output", default=None, help="CSV file to write the results table to")
+    arguments = parser.parse_args()
+
+    difficulties = [Difficulty[name] for name in arguments.difficulty] if arguments.difficulty else None
+    rows = run_tournament(arguments.solvers, difficulties, arguments.games, arguments.seed, arguments.processes,
+                          *arguments.size, arguments.max_turns)
+    print_results(rows)
+    if arguments.output is not None:
+        write_results(rows, arguments.output)
+
+
+if __name__ == "__main__":
+    main()
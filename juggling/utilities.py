@@ -3,10 +3,41 @@
 Things that help with the maze game. Definitions n' such..
 """
 from enum import Enum
+import abc
+import collections
 import copy
+import heapq
+import importlib.util
+import sys
+import threading
+from array import array
 from random import choice, sample
 
 
+def lazy_import(name):
+    """ Import a module only once one of its attributes is used, e.g. pygame by modules only drawing with it
+
+    Returns the module at once. The module really runs on first use, such that importing the game logic does not pay
+    for starting up pygame or numpy.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+# numpy is optional (see Backend), None when it is not installed
+numpy = lazy_import("numpy") if importlib.util.find_spec("numpy") is not None else None
+
+
 class Direction(Enum):
     """ Direction up down left or right """
     UP = (0, -1)
@@ -16,6 +47,15 @@ class Direction(Enum):
     STAY = (0, 0)
 
 
+# Directions that actually move
+CARDINALS = [Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT]
+
+
+def cardinal_steps(maze):
+    """ Pairs of each cardinal direction and the step it makes in flat (y * full_width + x) indices of maze """
+    return [(direction, direction.value[1] * maze.full_width + direction.value[0]) for direction in CARDINALS]
+
+
 class CellType(Enum):
     """ Cell Type for maze cells """
     EXIT = 0
@@ -23,29 +63,158 @@ class CellType(Enum):
     WALL = 2
 
 
+class Backend(Enum):
+    """ Engine used to compute distance fields over the whole maze
+
+    PYTHON floods the maze one cell at a time. NUMPY grows the whole wavefront at once with array shifts, and needs
+    numpy to be installed.
+    """
+    PYTHON = "python"
+    NUMPY = "numpy"
+
+    def check(self):
+        """ Raise if this backend cannot run here """
+        if self == Backend.NUMPY and numpy is None:
+            raise ImportError("Backend.NUMPY requires numpy. Install it with: pip install numpy")
+        return self
+
+
 class RandomWalk(object):
     """ Randomly walk the maze """
+    # Every call is a new step, there is no thinking to wait for
+    thinking = 1
 
     def next(self, position, maze, goal):
+        """ Get a next step """
+        return self.think(position, maze, goal)
+
+    def think(self, position, maze, goal):
         """ Get a next step """
         return choice(list(Direction))
 
 
-class FloodFill(object):
+class Solver(abc.ABC):
+    """ A difficulty's way of choosing the hunter's moves, thinking once every thinking turns """
+
     def __init__(self, thinking):
         self.thinking = thinking
         self.current = 0
 
     def next(self, position, maze, goal):
-        """ Next call """
-        move = Direction.STAY
-        if self.current == 0:
-            path = FloodFill.solve(maze, position, goal)
-            difference = path[1] - position
-            move = Direction.STAY if len(path) < 2 else Direction(difference)
+        """ Next call, thinking once every thinking calls """
+        move = self.think(position, maze, goal) if self.current == 0 else Direction.STAY
         self.current = (self.current + 1) % self.thinking
         return move
 
+    @abc.abstractmethod
+    def think(self, position, maze, goal):
+        """ Step toward the goal from position """
+
+
+class Search(Solver):
+    """ A solver searching for the first step of a shortest path each time it thinks (see first_step) """
+
+    def think(self, position, maze, goal):
+        """ Step toward the goal from position """
+        return self.first_step(maze, maze[position], maze[goal])
+
+    @classmethod
+    @abc.abstractmethod
+    def first_step(cls, maze, position, goal):
+        """ Direction of the first step of a shortest path from position to goal, STAY if there is none """
+
+
+class DistanceMap(object):
+    """ Distances from every cell to one goal, grown out from the goal only as far as has been asked for
+
+    The map is a breadth-first search from the goal that pauses as soon as the cell asked about has its distance, and
+    picks up where it left off when asked about a cell further away. Once a cell has a distance, stepping toward the
+    goal from it is a lookup of its neighbors. The map belongs to one revision of the maze and is stale after that.
+    """
+    def __init__(self, maze, goal):
+        """ Start a map of distances to goal """
+        self.maze = maze
+        self.revision = maze.revision
+        self.walkable = maze.walkable()
+        self.adjacency, self.moves = maze.adjacency(), maze.moves()
+        self.goal = goal.y * maze.full_width + goal.x
+        # Distance of each cell (y * full_width + x), -1 until the map has grown to it
+        self.distances = array("i", [-1]) * len(maze)
+        self.queue = collections.deque()
+        if self.walkable[self.goal]:
+            self.distances[self.goal] = 0
+            self.queue.append(self.goal)
+
+    def stale(self):
+        """ Check if the maze has changed since this map was started """
+        return self.revision != self.maze.revision
+
+    def distance(self, position):
+        """ Distance from position to the goal, growing the map as needed. None when the goal cannot be reached. """
+        index = position.y * self.maze.full_width + position.x
+        distances, queue, adjacency, moves = self.distances, self.queue, self.adjacency, self.moves
+        while distances[index] < 0 and queue:
+            current = queue.popleft()
+            distance = distances[current] + 1
+            for step in moves[adjacency[current]]:
+                neighbor = current + step
+                if distances[neighbor] < 0:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+        return distances[index] if distances[index] >= 0 else None
+
+    def step(self, position):
+        """ Direction of the first step from position toward the goal """
+        distance = self.distance(position)
+        if not distance:
+            return Direction.STAY
+        index = position.y * self.maze.full_width + position.x
+        for neighbor in self.maze.neighbors(index):
+            if self.distances[neighbor] == distance - 1:
+                return self.maze.direction(index, neighbor)
+        return Direction.STAY
+
+
+class FloodFill(Solver):
+    # Scratch score buffers of each thread, by maze size, that solve scores into instead of a copy of the maze
+    scratch = threading.local()
+
+    def __init__(self, thinking, cache_cells=1 << 22):
+        super().__init__(thinking)
+        self.cache_cells = cache_cells
+        self.maps = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def think(self, position, maze, goal):
+        """ Step toward the goal from position
+
+        Every hunter of this difficulty chasing the same goal reads the same distance map (see distance_map), so any
+        number of hunters cost one flood of the maze per position of the goal.
+        """
+        with self.lock:
+            return self.distance_map(maze, goal).step(maze[position])
+
+    def distance_map(self, maze, goal):
+        """ Get the distance map to goal, reusing a cached one for the goal unless the maze has since changed
+
+        Maps are kept for the latest goals, up to cache_cells cells across all maps, such that a goal that keeps still
+        (or comes back) is not solved again. Maps of a changed maze are dropped, and so are all the maps when another
+        maze is asked about, so a finished game's maze is not kept alive. The goal may be a cell, a player or (x, y)
+        coordinates.
+        """
+        goal = maze[goal]
+        if any(cached.maze is not maze for cached in self.maps.values()):
+            self.maps.clear()
+        key = (goal.x, goal.y)
+        distance_map = self.maps.pop(key, None)
+        if distance_map is None or distance_map.stale():
+            distance_map = DistanceMap(maze, goal)
+        self.maps[key] = distance_map
+        cells = sum(len(cached.distances) for cached in self.maps.values())
+        while cells > self.cache_cells and len(self.maps) > 1:
+            cells -= len(self.maps.popitem(last=False)[1].distances)
+        return distance_map
+
     @classmethod
     def recursive_scorer(cls, maze, current, score, end):
         """ Score each cell recursively from curren to end """
@@ -61,6 +230,37 @@ class FloodFill(object):
         [cls.recursive_scorer(maze, maze[current + step], score + 1, end) for step in randomized_directions]
         return
 
+    @classmethod
+    def breadth_first_scorer(cls, maze, start, end=None):
+        """ Score each cell with its distance from start, stopping once end is reached
+
+        Cells are visited in order of distance using a queue, so each cell is scored once with its final score and no
+        recursion is needed. Like the recursive scorer, cells already holding a lower score are left alone. The flood
+        runs over flat indices and the maze's adjacency, and the scores of a regular maze's cells are set at the end.
+        """
+        scores, adjacency, moves, width = maze.scores(), maze.adjacency(), maze.moves(), maze.full_width
+        start, end = start.y * width + start.x, end.y * width + end.x if end is not None else None
+        if not maze.walkable()[start] or scores[start] == 0:
+            return
+        scores[start] = 0
+        scored = [start]
+        queue = collections.deque([start])
+        while queue:
+            current = queue.popleft()
+            if current == end:
+                break
+            score = scores[current] + 1
+            for step in moves[adjacency[current]]:
+                neighbor = current + step
+                if 0 <= scores[neighbor] <= score:
+                    continue
+                scores[neighbor] = score
+                scored.append(neighbor)
+                queue.append(neighbor)
+        if not maze.compact:
+            for index in scored:
+                maze[index % width, index // width].score = scores[index]
+
     @classmethod
     def recursive_walker(cls, maze, current, score=None):
         """ Walk the maze recursively back to a score of zero """
@@ -73,28 +273,215 @@ class FloodFill(object):
         possible_steps = [maze[current + step] for step in Direction if maze[current + step].score < score]
         return [current] + cls.recursive_walker(maze, possible_steps[0], score - 1)
 
+    @classmethod
+    def walker(cls, maze, current, score=None):
+        """ Walk the maze back to a score of zero one step at a time, returning the path walked
+
+        Same walk as recursive_walker, but it loops instead of recursing and appends to one list instead of building a
+        new list per step, such that long paths cost neither stack depth nor quadratic copying. Only the scores of the
+        cells along the path and next to it are read: a compact maze's own score array, a regular maze's cells.
+        """
+        score = score if score is not None else current.score
+        width = maze.full_width
+        if maze.compact:
+            score_of = maze.scores().__getitem__
+        else:
+            def score_of(index):
+                return getattr(maze[index % width, index // width], "score", -1)
+        index, path = current.y * width + current.x, []
+        while index is not None:
+            assert score_of(index) <= score, f"Scoring failure. Algorithm score {score} != cell.score {score_of(index)}"
+            if score >= len(maze):
+                return None
+            path.append(maze[index % width, index // width])
+            if score == 0:
+                return path
+            index = next((neighbor for neighbor in maze.neighbors(index) if 0 <= score_of(neighbor) < score), None)
+            score -= 1
+        return None
+
+    @classmethod
+    def first_step(cls, maze, current):
+        """ Direction of the first step from current back toward a score of zero, without building the path """
+        score = getattr(current, "score", len(maze))
+        if score == 0 or score >= len(maze):
+            return Direction.STAY
+        width = maze.full_width
+        index = current.y * width + current.x
+        return next((maze.direction(index, neighbor) for neighbor in maze.neighbors(index)
+                     if getattr(maze[neighbor % width, neighbor // width], "score", len(maze)) < score), Direction.STAY)
+
+    @classmethod
+    def scratch_scores(cls, maze):
+        """ This thread's scratch score buffer (y * full_width + x) for mazes the size of maze, with no scores (-1) """
+        buffers = getattr(cls.scratch, "buffers", None)
+        if buffers is None:
+            buffers = cls.scratch.buffers = {}
+        if len(maze) not in buffers:
+            buffers[len(maze)] = (array("i", [-1]) * len(maze), array("i", [-1]) * len(maze))
+        scores, blank = buffers[len(maze)]
+        scores[:] = blank
+        return scores
+
+    @classmethod
+    def scratch_solve(cls, maze, position, goal):
+        """ Solve from position to goal scoring into the scratch buffer, leaving the maze untouched
+
+        The scores are a breadth-first flood from the goal that stops once position is scored. The path is then read
+        back by stepping to a neighbor one score lower until the goal is reached.
+        """
+        scores, adjacency, moves, width = cls.scratch_scores(maze), maze.adjacency(), maze.moves(), maze.full_width
+        start, end = goal.y * width + goal.x, position.y * width + position.x
+        if not maze.walkable()[start]:
+            return None
+        scores[start] = 0
+        queue = collections.deque([start])
+        while queue and scores[end] < 0:
+            current = queue.popleft()
+            score = scores[current] + 1
+            for step in moves[adjacency[current]]:
+                neighbor = current + step
+                if scores[neighbor] < 0:
+                    scores[neighbor] = score
+                    queue.append(neighbor)
+        if scores[end] < 0:
+            return None
+        path = [end]
+        while scores[path[-1]] > 0:
+            current = path[-1]
+            path.append(next(neighbor for neighbor in maze.neighbors(current)
+                             if scores[neighbor] == scores[current] - 1))
+        return [maze[index % width, index // width] for index in path]
+
     @classmethod
     def solve(cls, maze, position, goal, need_copy=True):
-        """ Solve the flood fill returning path """
-        maze = copy.deepcopy(maze) if need_copy else maze
+        """ Solve the flood fill returning path
+
+        With need_copy, the maze is left as it is and the scores go into a scratch buffer (see scratch_solve).
+        Otherwise the cells of the maze are scored, keeping any lower scores they already have.
+        """
         position = maze[position] if position is not None else None
         goal = maze[goal]
+        if need_copy:
+            return cls.scratch_solve(maze, position, goal) if position is not None else None
         # Initialize scores, if not already initialized
         for cell in maze:
-            if cell.type == CellType.WALL or need_copy:
+            if cell.type == CellType.WALL:
                 cell.score = len(maze) + 1
             else:
                 setattr(cell, "score", getattr(cell, "score", len(maze) + 1))
-        cls.recursive_scorer(maze, goal, 0, position)
+        cls.breadth_first_scorer(maze, goal, position)
         if position is not None:
-            path = cls.recursive_walker(maze, position, position.score)
+            path = cls.walker(maze, position, position.score)
             assert not path or not list(filter(lambda x: x is None, path)), f"None steps discovered in path: {path}"
             return path
         return None
 
     @classmethod
-    def cache(cls, maze, copy_needed=True):
+    def wavefront_scorer(cls, maze, start):
+        """ Score every cell with its distance from start using numpy
+
+        The wavefront is kept as an array of flat indices and grown one step at a time by adding the four cardinal
+        steps to all of it at once, keeping the unvisited cells reached. Each step costs the size of the wavefront
+        rather than the size of the maze. Walls and unreachable cells are scored len(maze) + 1, as the other scorers
+        leave them.
+        """
+        Backend.NUMPY.check()
+        unvisited = numpy.frombuffer(maze.cell_types(), dtype=numpy.uint8) != CellType.WALL.value
+        scores = numpy.full(len(maze), len(maze) + 1, dtype=numpy.int32)
+        steps = numpy.array([step for _, step in cardinal_steps(maze)], dtype=numpy.intp)
+        frontier = numpy.array([start.y * maze.full_width + start.x], dtype=numpy.intp)
+        frontier = frontier[unvisited[frontier]]
+        score = 0
+        while frontier.size:
+            scores[frontier] = score
+            unvisited[frontier] = False
+            # Walkable cells are walled in by the border, so every step from one stays inside the maze
+            grown = (frontier[:, None] + steps).ravel()
+            frontier = numpy.unique(grown[unvisited[grown]])
+            score += 1
+        maze.set_scores(scores)
+
+    @classmethod
+    def cache(cls, maze, copy_needed=True, backend=Backend.PYTHON):
         """ Precache the solutions for every cell """
         maze_copy = copy.deepcopy(maze) if copy_needed else maze
-        cls.solve(maze_copy, None, maze_copy.exit, False)
+        if backend.check() == Backend.NUMPY:
+            cls.wavefront_scorer(maze_copy, maze_copy.exit)
+        else:
+            cls.solve(maze_copy, None, maze_copy.exit, False)
         return maze_copy
+
+
+class AStar(Search):
+    """ Search from the hunter toward the goal, trying first the cells that look closest (Manhattan distance)
+
+    Only the first step toward the goal is needed, so every cell remembers the first step taken from the hunter to
+    reach it and the search stops as soon as the goal comes up. The cost of a move grows with the length of the path
+    rather than the size of the maze.
+    """
+
+    @classmethod
+    def first_step(cls, maze, position, goal):
+        """ Direction of the first step of a shortest path from position to goal, STAY if there is none """
+        adjacency, moves, width = maze.adjacency(), maze.moves(), maze.full_width
+        start, end = position.y * width + position.x, goal.y * width + goal.x
+        if start == end or not maze.walkable()[end]:
+            return Direction.STAY
+        # Cells reached so far, with their distance from the start and first step taken to get there
+        reached = {start: (0, Direction.STAY)}
+        queue = [(0, 0, start)]
+        while queue:
+            _, _, current = heapq.heappop(queue)
+            if current == end:
+                return reached[end][1]
+            distance, first = reached[current]
+            for step in moves[adjacency[current]]:
+                neighbor = current + step
+                if neighbor in reached and reached[neighbor][0] <= distance + 1:
+                    continue
+                reached[neighbor] = (distance + 1, maze.direction(start, neighbor) if current == start else first)
+                y, x = divmod(neighbor, width)
+                guess = abs(x - goal.x) + abs(y - goal.y)
+                # Among equal total guesses, the cell closest to the goal goes first
+                heapq.heappush(queue, (distance + 1 + guess, guess, neighbor))
+        return Direction.STAY
+
+
+class BidirectionalSearch(Search):
+    """ Search out from both the hunter and the goal at once, until the two searches meet
+
+    Each round grows whichever search has the smaller frontier by one whole layer. Once the searches meet, the best
+    meeting cell of that layer gives a shortest path, and the first step of it was remembered by the hunter's search.
+    """
+
+    @classmethod
+    def first_step(cls, maze, position, goal):
+        """ Direction of the first step of a shortest path from position to goal, STAY if there is none """
+        walkable, adjacency, moves, width = maze.walkable(), maze.adjacency(), maze.moves(), maze.full_width
+        start, end = position.y * width + position.x, goal.y * width + goal.x
+        if start == end or not walkable[start] or not walkable[end]:
+            return Direction.STAY
+        # Cells reached by the hunter's search (distance, first step) and by the goal's search (distance)
+        forward, backward = {start: (0, Direction.STAY)}, {end: (0, None)}
+        frontiers = {True: [start], False: [end]}
+        while frontiers[True] and frontiers[False]:
+            outward = len(frontiers[True]) <= len(frontiers[False])
+            reached, other = (forward, backward) if outward else (backward, forward)
+            layer, best = [], None
+            for current in frontiers[outward]:
+                distance, first = reached[current]
+                for step in moves[adjacency[current]]:
+                    neighbor = current + step
+                    if neighbor in reached:
+                        continue
+                    first_step = (maze.direction(start, neighbor) if current == start else first) if outward else None
+                    reached[neighbor] = (distance + 1, first_step)
+                    layer.append(neighbor)
+                    length = distance + 1 + other[neighbor][0] if neighbor in other else None
+                    if length is not None and (best is None or length < best[0]):
+                        best = (length, neighbor)
+            if best is not None:
+                return forward[best[1]][1]
+            frontiers[outward] = layer
+        return Direction.STAY